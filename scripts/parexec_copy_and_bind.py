@@ -9,49 +9,181 @@ Make sure the corresponding toggle is enabled in the Parameter Execute DAT.
 from typing import Any, List
 import re
 
-def adjust_menu_source(par, parent1):
-    menu_source = par.menuSource
-    if isinstance(menu_source, str) and menu_source.startswith('tdu.TableMenu('):
-        # Try to extract the inner op() path and rewrite as absolute
-        match = re.search(r"op\(['\"](.+?)['\"]\)", menu_source)
-        if match:
-            rel_path = match.group(1)
-            dat_op = parent1.op(rel_path)
-            if dat_op:
-                abs_path = dat_op.path
-                # Replace the op('./...') call with the absolute path
-                new_menu_source = re.sub(
-                    r"op\(['\"].+?['\"]\)",
-                    "op('{}')".format(abs_path),
-                    menu_source
-                )
-                return new_menu_source
-    return menu_source  # fallback, return as-is
-
-
-def adjust_strmenu_source(par, parent1):
+# Page created on the target COMP that mirrors the module's custom parameters
+PAGE_NAME = 'Presetter'
+
+# Exclude list: parameters that should not be copied or bound
+EXCLUDE_PARS = frozenset({'Targetop', 'Copybindparstotarget'})
+
+# Parameter style -> Page.append* method name
+APPEND_METHODS = {
+    'Float': 'appendFloat',
+    'Int': 'appendInt',
+    'Str': 'appendStr',
+    'Menu': 'appendMenu',
+    'StrMenu': 'appendStrMenu',
+    'Toggle': 'appendToggle',
+    'Pulse': 'appendPulse',
+    'RGB': 'appendRGB',
+    'RGBA': 'appendRGBA',
+    'Folder': 'appendFolder',
+    'File': 'appendFile',
+    'FileSave': 'appendFileSave',
+    # Add more as needed
+}
+
+# Properties copied from the source parameter to the new parameter, in order.
+# Each entry is (property name, predicate); the property is only copied when
+# the predicate accepts the source value (None means always copy).
+PROPERTY_COPY_TABLE = (
+    ('startSection', lambda v: bool(v)),
+    ('enable', None),
+    ('readOnly', None),
+    ('enableExpr', lambda v: bool(v) and bool(str(v).strip())),
+    ('normMin', None),
+    ('normMax', None),
+    ('clampMin', None),
+    ('clampMax', None),
+)
+
+_TABLEMENU_OP_RE = re.compile(r"op\(['\"](.+?)['\"]\)")
+_STRMENU_PATTERN_RE = re.compile(r"op\(['\"]\.\/parameter1['\"]\)\.par\.(parameters|pages)")
+_STRMENU_OP_RE = re.compile(r"op\(['\"]\.\/parameter1['\"]\)")
+
+# Memoized menuSource parsing: (style, menuSource) -> relative DAT path (Menu),
+# True (StrMenu) or None when the source needs no rewrite. Independent of the
+# module copy, so batch installs share the entries
+_menu_source_cache = {}
+
+
+def parse_menu_source(par_type, menu_source):
+    """
+    Return what needs rewriting in a Menu/StrMenu menuSource: the relative
+    DAT path of a tdu.TableMenu (Menu), True for an op('./parameter1')
+    reference (StrMenu), or None if the source is used as-is.
     """
-    Adjust StrMenu menuSource for special cases where it references
-    op('./parameter1').par.parameters or op('./parameter1').par.pages
-    Updates to op('parent1.path/parameter1').par.parameters or
-    op('parent1.path/parameter1').par.pages
+    if not isinstance(menu_source, str):
+        return None
+    if par_type == 'Menu':
+        if menu_source.startswith('tdu.TableMenu('):
+            match = _TABLEMENU_OP_RE.search(menu_source)
+            if match:
+                return match.group(1)
+        return None
+    if _STRMENU_PATTERN_RE.search(menu_source):
+        return True
+    return None
+
+
+def get_menu_source(par, parent1):
     """
+    Return the rewritten menuSource for a Menu/StrMenu parameter.
+    Parsing is memoized per (style, menuSource), so cloning onto many
+    targets only runs the regex searches once per distinct source; the
+    per-copy rewrite is a single substitution.
+    """
+    par_type = par.style
     menu_source = par.menuSource
-    if isinstance(menu_source, str):
-        # Check if menuSource matches the pattern op('./parameter1').par.parameters or op('./parameter1').par.pages
-        pattern = r"op\(['\"]\.\/parameter1['\"]\)\.par\.(parameters|pages)"
-        match = re.search(pattern, menu_source)
-        if match:
-            # Replace op('./parameter1') with op('parent1.path/parameter1')
-            # using absolute path from parent1
-            parent1_path = parent1.path
-            new_menu_source = re.sub(
-                r"op\(['\"]\.\/parameter1['\"]\)",
-                "op('{}/parameter1')".format(parent1_path),
-                menu_source
-            )
-            return new_menu_source
-    return menu_source  # fallback, return as-is
+    key = (par_type, menu_source)
+    try:
+        parsed = _menu_source_cache[key]
+    except KeyError:
+        parsed = parse_menu_source(par_type, menu_source)
+        _menu_source_cache[key] = parsed
+    if parsed is None:
+        return menu_source
+
+    if par_type == 'Menu':
+        dat_op = parent1.op(parsed)
+        if not dat_op:
+            return menu_source
+        # Replace the op('./...') call with the absolute path
+        return _TABLEMENU_OP_RE.sub("op('{}')".format(dat_op.path), menu_source)
+    # Replace op('./parameter1') with op('parent1.path/parameter1')
+    return _STRMENU_OP_RE.sub("op('{}/parameter1')".format(parent1.path), menu_source)
+
+
+def get_or_create_page(target, page_name=PAGE_NAME):
+    """Return the custom page named page_name on target, creating it if needed."""
+    for page in target.customPages:
+        if page.name == page_name:
+            return page
+    return target.appendCustomPage(page_name)
+
+
+def copy_par_properties(par, new_par, parent1):
+    """Copy properties, menu source, default and value from par to new_par."""
+    for prop, accept in PROPERTY_COPY_TABLE:
+        try:
+            value = getattr(par, prop)
+            if accept is None or accept(value):
+                setattr(new_par, prop, value)
+        except Exception:
+            pass
+
+    if par.style in ('Menu', 'StrMenu'):
+        try:
+            new_par.menuSource = get_menu_source(par, parent1)
+        except Exception:
+            pass
+    try:
+        new_par.default = par.default
+    except Exception:
+        pass
+    # Copy current value from original parameter to new parameter
+    try:
+        new_par.val = par.val
+    except Exception:
+        # If direct val assignment fails, try using eval()
+        try:
+            new_par.val = par.eval()
+        except Exception:
+            pass
+
+
+def clone_page(parent1, target, exclude_pars=EXCLUDE_PARS, page_name=PAGE_NAME):
+    """
+    Clone parent1's custom parameters onto a custom page on target.
+    Parameters that already exist on the page are left untouched, so
+    re-running is idempotent. Returns the number of parameters created.
+    """
+    custom_page = get_or_create_page(target, page_name)
+    existing_names = {p.name for p in custom_page.pars}
+
+    created = 0
+    for par in parent1.customPars:  # <-- custom parameters only!
+        name = par.name
+        if name in exclude_pars or name in existing_names:
+            continue
+        method_name = APPEND_METHODS.get(par.style)
+        if method_name is None:
+            continue
+        new_par = getattr(custom_page, method_name)(name, label=par.label)
+        existing_names.add(name)
+        copy_par_properties(par, new_par, parent1)
+        created += 1
+        # ----- Use bindExpr! -----
+        #new_par.bindExpr = "op('{}').par.{}".format(parent1.path, name)
+    return created
+
+
+def bind_to_target(parent1, target, exclude_pars=EXCLUDE_PARS):
+    """Bind parent1's custom parameters to the same-named parameters on target."""
+    target_path = target.path
+    for par in parent1.customPars:
+        # Skip excluded parameters
+        if par.name in exclude_pars:
+            continue
+        bind_expr = "op('{}').par.{}".format(target_path, par.name)
+        # Only assign when changed to avoid needless re-cooks on re-runs
+        if par.bindExpr != bind_expr:
+            par.bindExpr = bind_expr
+
+
+def copy_and_bind(parent1, target):
+    """Clone the Presetter page onto target and bind parent1's parameters to it."""
+    clone_page(parent1, target)
+    bind_to_target(parent1, target)
 
 
 def onPulse(par: Par):
@@ -61,144 +193,14 @@ def onPulse(par: Par):
     #op('fileout1').par.write.pulse()
     parent1 = parent()  # Adjust path as needed
     parent2 = parent().par.Targetop.eval()  # Adjust path as needed
+    if parent2 is None:
+        return
+
+    copy_and_bind(parent1, parent2)
 
-    # Exclude list: parameters that should not be copied or bound
-    exclude_pars = {'Targetop', 'Copybindparstotarget'}  # Add parameter names to exclude, e.g., {'par1', 'par2'}
-
-    page_name = "Presetter"
-    if page_name not in [p.name for p in parent2.customPages]:
-        custom_page = parent2.appendCustomPage(page_name)
-    else:
-        custom_page = parent2.customPages[page_name]
-
-    par_list = parent1.customPars  # <-- custom parameters only!
-
-    type_map = {
-        'Float': custom_page.appendFloat,
-        'Int': custom_page.appendInt,
-        'Str': custom_page.appendStr,
-        'Menu': custom_page.appendMenu,
-        'StrMenu': custom_page.appendStrMenu,
-        'Toggle': custom_page.appendToggle,
-        'Pulse': custom_page.appendPulse,
-        'RGB': custom_page.appendRGB,
-        'RGBA': custom_page.appendRGBA,
-        'Folder': custom_page.appendFolder,
-        'File': custom_page.appendFile,
-        'FileSave': custom_page.appendFileSave,
-        # Add more as needed
-    }
-
-    for par in par_list:
-        name = par.name
-        # Skip excluded parameters
-        if name in exclude_pars:
-            continue
-        label = par.label
-        par_type = par.style
-        append_func = type_map.get(par_type, None)
-        if append_func and not any(p.name == name for p in custom_page.pars):
-            new_par = append_func(name, label=label)
-            
-            # Copy startSection property if it's enabled (section toggle)
-            try:
-                if hasattr(par, 'startSection') and par.startSection:
-                    new_par.startSection = True
-            except Exception:
-                pass
-            
-            # Copy enable property
-            try:
-                if hasattr(par, 'enable'):
-                    new_par.enable = par.enable
-            except Exception:
-                pass
-            
-            # Copy readOnly property
-            try:
-                if hasattr(par, 'readOnly'):
-                    new_par.readOnly = par.readOnly
-            except Exception:
-                pass
-            
-            # Copy enableExpr property if not empty
-            try:
-                if hasattr(par, 'enableExpr'):
-                    enable_expr = par.enableExpr
-                    if enable_expr and str(enable_expr).strip():
-                        new_par.enableExpr = enable_expr
-            except Exception:
-                pass
-            
-            # Copy normMin property
-            try:
-                if hasattr(par, 'normMin'):
-                    new_par.normMin = par.normMin
-            except Exception:
-                pass
-            
-            # Copy normMax property
-            try:
-                if hasattr(par, 'normMax'):
-                    new_par.normMax = par.normMax
-            except Exception:
-                pass
-            
-            # Copy clampMin property
-            try:
-                if hasattr(par, 'clampMin'):
-                    new_par.clampMin = par.clampMin
-            except Exception:
-                pass
-            
-            # Copy clampMax property
-            try:
-                if hasattr(par, 'clampMax'):
-                    new_par.clampMax = par.clampMax
-            except Exception:
-                pass
-            
-            if par_type == 'Menu':
-                menu_source_path = adjust_menu_source(par, parent1)
-                try:
-                    new_par.menuSource = menu_source_path
-                except Exception:
-                    pass
-            elif par_type == 'StrMenu':
-                strmenu_source_path = adjust_strmenu_source(par, parent1)
-                try:
-                    new_par.menuSource = strmenu_source_path
-                except Exception:
-                    pass
-            try:
-                new_par.default = par.default
-            except Exception:
-                pass
-            # Copy current value from original parameter to new parameter
-            try:
-                new_par.val = par.val
-            except Exception:
-                # If direct val assignment fails, try using eval()
-                try:
-                    new_par.val = par.eval()
-                except Exception:
-                    pass
-            # ----- Use bindExpr! -----
-            #new_par.bindExpr = "op('{}').par.{}".format(parent1.path, name)
-
-    
    #parent(2).par.Delscope = '*'
     #parent(2).par.Presetfolder.expr = "'Data/Presets/'+me.path.replace('/','.')"
-    
-    #'Presets'+me.path.replace('/','.')
-
-
-    for par in parent1.customPars:
-        # Skip excluded parameters
-        if par.name in exclude_pars:
-            continue
-        par.bindExpr = "op('{}').par.{}".format(parent2.path, par.name)
 
+    #'Presets'+me.path.replace('/','.')
 
     return
-
@@ -1,53 +1,290 @@
 
 from TDStoreTools import StorageManager
-import TDFunctions as TDF
-import ast
-import random
 import os
 import math
+import time
+import weakref
+import numpy as np
+
+# Modules used only by on-demand features (masks, compression, journal, sync,
+# remote control, ...) are imported in the methods that use them, so
+# initializing the extension only loads what every instance needs
+
+# Frames to wait before syncing Presetmenu, so its menu items refresh first
+MENU_REFRESH_FRAMES = 5
+# Frames to wait before clearing Has_changed after applying a preset, so
+# parameter change callbacks triggered by the apply have completed
+CHANGED_RESET_FRAMES = 2
+
+# Key of the stub that replaces a preset moved out to the disk cache
+SPILLED_KEY = '__presetter_spilled__'
+
+# Key of the stub holding a zlib-compressed preset: (payload, parameter count)
+COMPRESSED_KEY = '__presetter_zlib__'
+# Decompressed presets kept in memory (least recently used are dropped)
+DECODE_CACHE_SIZE = 32
+
+# Default UDP port and OSC address prefix of the remote control listener
+REMOTE_PORT = 7000
+REMOTE_PREFIX = '/presetter'
+# Seconds a listener thread blocks in recv before checking whether it was stopped
+SOCKET_POLL_SECONDS = 0.25
+
+# Largest sync datagram payload, below a typical 1500 byte MTU so datagrams
+# are not IP-fragmented; bigger messages are split into chunks
+SYNC_CHUNK_SIZE = 1200
+# Seconds between library digests sent to sync peers (detects lost datagrams)
+SYNC_DIGEST_SECONDS = 2.0
+
+# Journal records appended before the journal is compacted into a snapshot
+JOURNAL_COMPACT_RECORDS = 500
+
+# Library changes remembered for shared instances; instances further behind drop all caches
+LIBRARY_LOG_SIZE = 256
+
+# Samples of the easing lookup tables used by per-parameter transition timing
+EASING_LUT_SIZE = 1024
+
+# Assumed cost of one parameter write (seconds) until lerp writes were measured
+LERP_WRITE_COST = 20e-6
 
 class presetterext:
 
 	def __init__(self, ownerComp):
+		init_start = time.perf_counter()
+
 		# The component to which this extension is attached
 		self.ownerComp = ownerComp
 
 		# Reference to table DAT containing parameter names and values
 		self.par_table = self.ownerComp.op('par_table')
 
+		# Shared library: Presets/PresetNames may live in another Presetter.
+		# Resolution is enabled at the end of __init__.
+		self._library_ref = None
+		self._library_ext = None
+		self._library_frame = None
+		self._library_ready = False
+		self._library_seen = 0
+		self._library_version = 0
+		# Change log [(presetname, new name if renamed), ...] and the instances using this library
+		self._library_changes = []
+		self._library_users = weakref.WeakSet()
+
 		# Stored items (persistent across saves and re-initialization)
+		# Presets and PresetNames are exposed by the Presets/PresetNames
+		# properties below, which follow a shared library
 		storedItems = [
 			{'name': 'Presets', 'default': {}, 'readOnly': False,
-			 						'property': True, 'dependable': True},
+			 						'property': False, 'dependable': True},
 			{'name': 'CurrentPresetName', 'default': None, 'readOnly': False,
 			 						'property': True, 'dependable': True},
 			{'name': 'PresetNames', 'default': [], 'readOnly': False,
+			 						'property': False, 'dependable': True},
+			{'name': 'Masks', 'default': {}, 'readOnly': False,
+			 						'property': True, 'dependable': True},
+			{'name': 'Timings', 'default': {}, 'readOnly': False,
 			 						'property': True, 'dependable': True},
+			{'name': 'Curves', 'default': {}, 'readOnly': False,
+			 						'property': True, 'dependable': True},
+			{'name': 'SyncVersions', 'default': {}, 'readOnly': False,
+			 						'property': False, 'dependable': False},
 		]
 		self.Has_changed = False
 		self.stored = StorageManager(self, ownerComp, storedItems)
 
 		# Lerp state tracking variables
 		self._lerp_active = False
-		self._lerp_start_values = {}
-		self._lerp_target_values = {}
 		self._lerp_start_time = None
 		self._lerp_duration = 0.0
-		self._lerp_non_numeric_params = {}
-		self._lerp_target_op = None
-		
+		self._lerp_non_numeric_params = []
+		self._lerp_target_ops = []
+		self._lerp_easing = None
+		self._lerp_paused = False
+		# Progress = origin + direction * elapsed / duration (pause, resume, reverse)
+		self._lerp_direction = 1.0
+		self._lerp_progress_origin = 0.0
+		self._lerp_velocity_term = None
+		self._lerp_prev_preset = None
+		# Compiled per-parameter timing of the active lerp (None = uniform timing)
+		self._lerp_timing = None
+		# Layer priority of the main lerp, start order, and the writes it
+		# owns after priority resolution against lerp layers
+		self._lerp_priority = 0
+		self._lerp_seq = 0
+		self._lerp_active_writes = []
+		# Write suppression: owned non-static writes and the last written values
+		self._lerp_write_index = None
+		self._lerp_written = None
+		# Adaptive write budget (None = use the Lerpbudget parameter), measured
+		# seconds per parameter write and update counts of the active lerp
+		self._lerp_budget = None
+		self._lerp_write_cost = None
+		self._lerp_budget_stats = None
+		self._reset_lerp_budget_stats()
+
+		# Concurrent lerp layers: {layer name: layer state dict}
+		self._lerp_layers = {}
+		self._lerp_seq_counter = 0
+
+		# Packed numeric lerp values: each parameter occupies
+		# buffer[offset:offset + width] in flat float arrays
+		self._lerp_writes = []
+		self._lerp_start = None
+		self._lerp_delta = None
+		self._lerp_target = None
+		self._lerp_buffer = np.zeros(0, dtype=np.float64)
+		self._lerp_channel_names = []
+		self._lerp_layout_version = 0
+		self._lerp_output = 'pars'
+		self._lerp_output_mode = None
+		self._chop_layout_version = -1
+		self._chop_buffer = None
+
+		# Multi-target mode: list of OPs/paths or a pattern string (None uses Targetop)
+		self._targets = None
+
+		# Weighted multi-preset blend: one row of packed values per preset
+		self._blend_presets = []
+		self._blend_matrix = None
+		self._blend_writes = []
+		self._blend_write_index = None
+		self._blend_written = None
+		self._blend_buffer = None
+		self._blend_channel_names = []
+		self._blend_non_numeric = []
+		self._blend_weights = None
+		self._blend_dominant = -1
+		self._blend_positions = None
+		self._blend_weight_source = None
+
+		# Spline path through several presets: cubic coefficients per segment
+		self._path_presets = []
+		self._path_coeffs = None
+		self._path_writes = []
+		self._path_write_index = None
+		self._path_written = None
+		self._path_buffer = None
+		self._path_channel_names = []
+		self._path_non_numeric = []
+		self._path_position = 0.0
+		self._path_point = -1
+		self._path_playing = False
+		self._path_start_time = 0.0
+		self._path_origin = 0.0
+		self._path_duration = 1.0
+		self._path_loop = False
+		self._path_easing = None
+
+		# Sequencer state (playlist of preset steps)
+		self._seq_steps = []
+		self._seq_index = -1
+		self._seq_loop = False
+		self._seq_playing = False
+		self._seq_paused = False
+		self._seq_step_start = None
+		self._seq_pause_time = None
+		self._seq_prepared = {}
+		self._seq_prefetch_pending = False
+
+		# Derived per-preset caches (rebuilt on demand, never persisted)
+		self._preset_groups = {}
+		# Resolved masks: {(mask key, target path): names} and
+		# {presetname: {(mask key, target path): (names, groups)}}
+		self._mask_target_cache = {}
+		self._mask_preset_cache = {}
+		# Preset validation: {presetname: {target signature: result}} and
+		# {target path: (frame, signature)}
+		self._validation_cache = {}
+		self._target_signatures = {}
+		self._numeric_par_cache = {}
+		# Sampled easing curves: {method name: values at EASING_LUT_SIZE + 1 points}
+		self._easing_luts = {}
+		# Sampled custom easing curves: {curve name: entry dict}, see _curve_entry
+		self._curve_luts = {}
+
+		# Nearest-preset search: packed raw numeric values, one row per preset,
+		# built on first query and then updated incrementally on save/delete
+		self._nearest_matrix = None
+		self._nearest_rows = {}
+		self._nearest_names = []
+		self._nearest_columns = {}
+		self._nearest_scale = None
+		self._nearest_scale_key = None
+
+		# Menu value set by SelectNearestPreset that must not load the preset
+		self._menu_select_only = None
+
+		# Memory budget: estimated preset sizes and least-recently-used order
+		self._memory_budget = None
+		self._preset_sizes = {}
+		self._preset_last_used = {}
+		self._preset_use_counter = 0
+
+		# Compressed storage (None = use the Compress parameter) and decoded presets
+		self._compression = None
+		self._decoded_presets = {}
+
+		# Append-only change journal (None = use the Journal parameter)
+		self._journal_path = None
+		self._journal_records = 0
+		self._journal_compact_scheduled = False
+		self._journal_ready = None
+
+		# Remote control: UDP/OSC listener thread feeding a per-frame command queue
+		self._remote_thread = None
+		self._remote_socket = None
+		self._remote_queue = None
+		self._remote_latencies = None
+		self._remote_prefix = REMOTE_PREFIX
+
+		# Library sync between instances: per-preset versions (stored, kept for
+		# deleted presets too), the Lamport clock resumed from them, content
+		# hashes of the presets and the UDP transport
+		self._sync_versions = self.stored['SyncVersions']
+		self._sync_clock = max((version[0] for version in self._sync_versions.values()), default=0)
+		self._content_hashes = {}
+		self._sync_node = None
+		self._sync_seq = 0
+		self._sync_message_id = 0
+		self._sync_peer_seqs = {}
+		self._sync_peers = []
+		self._sync_next_digest = 0.0
+		self._sync_thread = None
+		self._sync_socket = None
+		self._sync_queue = None
+
+		# Coalesced UI refresh: dirty flags flushed by one deferred callback
+		self._ui_info_dirty = False
+		self._ui_menu_wait = None
+		self._ui_reset_wait = None
+		self._ui_flush_scheduled = False
+
 		# Get reference to Execute DAT for lerp updates
 		try:
 			self.lerp_execute = self.ownerComp.op('lerp_execute')
 		except Exception:
 			self.lerp_execute = None
 
+		# Script CHOP exporting the lerp channel buffer (channels output mode)
+		try:
+			self.lerp_chop = self.ownerComp.op('lerp_chop')
+		except Exception:
+			self.lerp_chop = None
+
 		# Setup parameters
 		#self.SetupPars()
 
-		# Update preset names list
+		# The stored PresetNames is the persisted snapshot of the sorted names;
+		# only rebuild it (deferred to the UI flush) when it is out of date
+		self._preset_names_stale = len(self.PresetNames) != len(self.Presets)
+		self._init_names_stale = self._preset_names_stale
 		self.UpdateInfo()
-		self.UpdatePresetNames()
+
+		self._library_ready = True
+
+		# Startup timing hook, see GetStartupTiming()
+		self._init_duration = time.perf_counter() - init_start
 
 
 
@@ -104,9 +341,109 @@ class presetterext:
 		"""Update PresetNames list with current preset names."""
 		preset_names = sorted(list(self.Presets.keys()))
 		self.PresetNames = preset_names
+		self._preset_names_stale = False
+
+	def _add_preset_name(self, presetname):
+		"""Insert a new preset name into the sorted PresetNames without a full re-sort."""
+		import bisect
+
+		if self._preset_names_stale:
+			self.UpdatePresetNames()
+			return
+		preset_names = list(self.PresetNames)
+		index = bisect.bisect_left(preset_names, presetname)
+		if index < len(preset_names) and preset_names[index] == presetname:
+			return
+		preset_names.insert(index, presetname)
+		self.PresetNames = preset_names
+
+	def _remove_preset_name(self, presetname):
+		"""Remove a preset name from the sorted PresetNames without a full re-sort."""
+		import bisect
+
+		if self._preset_names_stale:
+			self.UpdatePresetNames()
+			return
+		preset_names = list(self.PresetNames)
+		index = bisect.bisect_left(preset_names, presetname)
+		if index < len(preset_names) and preset_names[index] == presetname:
+			del preset_names[index]
+			self.PresetNames = preset_names
+
+	def GetStartupTiming(self):
+		"""
+		Return how long the last extension initialization took, e.g. to check
+		that startup stays flat as the library grows.
+		Returns dict: 'init_ms', 'presets', 'names_rebuilt' (rebuild was needed)
+		"""
+		return {
+			'init_ms': self._init_duration * 1000.0,
+			'presets': len(self.Presets),
+			'names_rebuilt': self._init_names_stale,
+		}
 
 	def UpdateInfo(self):
-		"""Update Monitorstr parameter to show current preset status."""
+		"""
+		Request a Monitorstr refresh. Any number of requests within a frame
+		are coalesced into one update by the deferred UI flush.
+		"""
+		self._ui_info_dirty = True
+		self._schedule_ui_flush()
+
+	def UpdateMenu(self):
+		"""
+		Request a Presetmenu sync to CurrentPresetName. Coalesced like
+		UpdateInfo; the menu is written MENU_REFRESH_FRAMES after the last request.
+		"""
+		self._ui_menu_wait = MENU_REFRESH_FRAMES
+		self._schedule_ui_flush()
+
+	def _mark_preset_applied(self):
+		"""
+		Clear Has_changed once the parameter changes of a load have settled
+		(after CHANGED_RESET_FRAMES), and refresh Monitorstr.
+		"""
+		self._ui_reset_wait = CHANGED_RESET_FRAMES
+		self.UpdateInfo()
+
+	def _schedule_ui_flush(self):
+		"""Queue the UI flush for the next frame unless it is already queued."""
+		if not self._ui_flush_scheduled:
+			self._ui_flush_scheduled = True
+			run(self._flush_ui, delayFrames=1)
+
+	def _flush_ui(self):
+		"""
+		Apply pending UI refreshes once per frame. Re-queues itself (one
+		callback at a time) while a delayed menu sync or Has_changed reset is pending.
+		"""
+		self._ui_flush_scheduled = False
+
+		if self._preset_names_stale:
+			self.UpdatePresetNames()
+
+		if self._ui_reset_wait is not None:
+			self._ui_reset_wait -= 1
+			if self._ui_reset_wait <= 0:
+				self._ui_reset_wait = None
+				self.Has_changed = False
+				self._ui_info_dirty = True
+
+		if self._ui_info_dirty:
+			self._ui_info_dirty = False
+			self._write_monitor()
+
+		if self._ui_menu_wait is not None:
+			self._ui_menu_wait -= 1
+			if self._ui_menu_wait <= 0:
+				self._ui_menu_wait = None
+				self._write_menu()
+
+		if self._ui_reset_wait is not None or self._ui_menu_wait is not None:
+			self._schedule_ui_flush()
+
+	def _write_monitor(self):
+		"""Write the current preset status to Monitorstr."""
 		if self.CurrentPresetName is None:
 			# No preset loaded
 			display_text = "No preset loaded"
@@ -120,13 +457,14 @@ class presetterext:
 				display_text = self.CurrentPresetName
 		
 		try:
-			self.ownerComp.par.Monitorstr = display_text
+			if self.ownerComp.par.Monitorstr.eval() != display_text:
+				self.ownerComp.par.Monitorstr = display_text
 		except Exception:
 			# Monitorstr parameter might not exist, silently fail
 			pass
 
-	def UpdateMenu(self):
-		"""Update Presetmenu parameter to match CurrentPresetName."""
+	def _write_menu(self):
+		"""Sync Presetmenu to CurrentPresetName."""
 		try:
 			preset_menu = self.ownerComp.par.Presetmenu
 			if preset_menu is None:
@@ -135,14 +473,17 @@ class presetterext:
 			# Get the value to set (None becomes 'None' for menu)
 			menu_value = self.CurrentPresetName if self.CurrentPresetName is not None else 'None'
 			
-			# Use delayed update to avoid triggering callbacks
 			# Check if menu value needs to change to avoid unnecessary updates
-			current_menu_val = preset_menu.eval()
-			if current_menu_val != menu_value:
-				run(lambda: setattr(self.ownerComp.par, 'Presetmenu', menu_value), delayFrames=5)
+			if preset_menu.eval() != menu_value:
+				if self._menu_select_only != menu_value:
+					self._menu_select_only = None
+				self.ownerComp.par.Presetmenu = menu_value
+				return
 		except Exception:
 			# Presetmenu parameter might not exist, silently fail
 			pass
+		# No menu write, so no menu callback will consume the select-only flag
+		self._menu_select_only = None
 
 	def _read_pars_from_dat_table(self, dat_table):
 		"""
@@ -150,6 +491,8 @@ class presetterext:
 		Skips first row (header).
 		Returns dict: {par_name: value, ...}
 		"""
+		import ast
+
 		if dat_table is None:
 			print("Warning: DAT table not found")
 			return {}
@@ -233,26 +576,349 @@ class presetterext:
 		except Exception:
 			return False
 
+	def _is_lerp_capable(self, target_op, par):
+		"""
+		Cached _is_numeric_parameter: classification per target and parameter
+		name is done once, as it needs a style check and possibly an eval.
+		"""
+		key = (target_op.path, par.name)
+		is_numeric = self._numeric_par_cache.get(key)
+		if is_numeric is None:
+			is_numeric = self._is_numeric_parameter(par)
+			self._numeric_par_cache[key] = is_numeric
+		return is_numeric
+
 	def _cancel_lerp(self):
 		"""
 		Cancel any active lerp and clear lerp state variables.
 		Also disables the Execute DAT if it exists.
 		"""
 		self._lerp_active = False
-		self._lerp_start_values = {}
-		self._lerp_target_values = {}
 		self._lerp_start_time = None
 		self._lerp_duration = 0.0
-		self._lerp_non_numeric_params = {}
-		self._lerp_target_op = None
-		
-		# Disable Execute DAT if it exists
+		self._lerp_non_numeric_params = []
+		self._lerp_target_ops = []
+		self._lerp_easing = None
+		self._lerp_paused = False
+		self._lerp_direction = 1.0
+		self._lerp_progress_origin = 0.0
+		self._lerp_velocity_term = None
+		self._lerp_prev_preset = None
+		self._lerp_timing = None
+		# The output buffer keeps its last values so exported channels hold
+		self._lerp_writes = []
+		self._lerp_active_writes = []
+		self._lerp_write_index = None
+		self._lerp_written = None
+		self._lerp_start = None
+		self._lerp_delta = None
+		self._lerp_target = None
+
+		# Layers get back the parameters the main lerp owned
+		self._resolve_lerp_priorities()
+
+		# Disable Execute DAT if nothing else needs frame updates
+		self._update_execute_active()
+
+	def _needs_frame_updates(self):
+		"""Return True while any per-frame work (remote, sync, lerp, layers, blend source, path, sequencer) is pending."""
+		return (self._lerp_active or bool(self._lerp_layers) or self._seq_playing
+			or self._blend_weight_source is not None or self._path_playing
+			or self._remote_thread is not None or self._sync_thread is not None)
+
+	def _update_execute_active(self):
+		"""Enable the Execute DAT while frame updates are needed, disable it otherwise."""
 		if self.lerp_execute is not None:
 			try:
-				self.lerp_execute.par.active = False
+				active = self._needs_frame_updates()
+				if self.lerp_execute.par.active.eval() != active:
+					self.lerp_execute.par.active = active
 			except Exception:
 				pass
 
+	def _get_target_op(self):
+		"""
+		Get the target OP from the Targetop parameter.
+		Prints a warning and returns None if it is missing or invalid.
+		"""
+		try:
+			target_op = self.ownerComp.par.Targetop.eval()
+		except Exception:
+			print("Warning: Targetop parameter not found or invalid")
+			return None
+
+		if target_op is None:
+			print("Warning: Target OP is None")
+		return target_op
+
+	def SetTargets(self, targets):
+		"""
+		Enable multi-target mode: presets are applied to every target in one pass.
+		targets is a list of OPs or paths, or a pattern string such as
+		'/project1/geo*' (several patterns separated by spaces), resolved
+		relative to this component. None returns to the single Targetop.
+		The optional Targetops parameter is used when no targets are set here.
+		"""
+		self._targets = targets
+		self._numeric_par_cache = {}
+		if self._lerp_active:
+			self._cancel_lerp()
+		self._seq_prepared = {}
+		return len(self._get_target_ops())
+
+	def _get_target_ops(self):
+		"""
+		Get the list of target OPs: SetTargets() targets, else the Targetops
+		parameter pattern if it exists and is set, else [Targetop].
+		Prints a warning and returns [] if there is no valid target.
+		"""
+		targets = self._targets
+		if targets is None:
+			try:
+				targets = self.ownerComp.par.Targetops.eval() or None
+			except Exception:
+				targets = None
+		if targets is None:
+			target_op = self._get_target_op()
+			return [target_op] if target_op is not None else []
+
+		if isinstance(targets, str):
+			target_ops = self.ownerComp.ops(*targets.split())
+		else:
+			target_ops = []
+			for target in targets:
+				if isinstance(target, str):
+					target = self.ownerComp.op(target)
+				if target is not None:
+					target_ops.append(target)
+
+		if not target_ops:
+			print("Warning: No target OPs found for multi-target mode")
+		return target_ops
+
+	def _resolve_par(self, target_op, par_name):
+		"""Return the parameter par_name on target_op, or None if it does not exist."""
+		try:
+			par = target_op.par[par_name]
+		except Exception:
+			par = None
+		if par is None:
+			# Try alternative access
+			par = getattr(target_op.par, par_name, None)
+		return par
+
+	def _convert_par_value(self, par, par_value):
+		"""
+		Convert a stored value to the type expected by the parameter.
+		Handles type mismatches (e.g., float value for int parameter).
+		Raises ValueError/TypeError if the conversion fails.
+		"""
+		par_style = getattr(par, 'style', '').lower()
+
+		if par_style == 'int':
+			# For int parameters, convert float/string to int
+			if isinstance(par_value, str):
+				# Try to parse string as float first, then convert to int
+				try:
+					return int(round(float(par_value)))
+				except (ValueError, TypeError):
+					return int(par_value)
+			elif isinstance(par_value, float):
+				return int(round(par_value))
+			return int(par_value)
+		elif par_style == 'float':
+			# For float parameters, ensure it's a float
+			return float(par_value)
+		elif par_style == 'str':
+			# For string parameters, convert to string
+			return str(par_value)
+		return par_value
+
+	def _set_par_value(self, par, par_value):
+		"""
+		Set a parameter value with proper type conversion.
+		If type conversion fails, tries setting the value as-is.
+		Raises if the value cannot be set at all.
+		"""
+		try:
+			par.val = self._convert_par_value(par, par_value)
+		except (ValueError, TypeError):
+			par.val = par_value
+
+	def _build_apply_plan(self, presetname, target_op, mask=None):
+		"""
+		Resolve a stored preset against target_op into an apply plan.
+		Parameter lookups and numeric classification happen once here, so the
+		plan can be prepared ahead of time and applied without setup cost.
+		Returns dict:
+			'preset': preset name, 'data': stored preset dict, 'target': target OP,
+			'entries': [(par_name, par, value, is_numeric), ...] in preset order,
+			'missing': [par_name, ...] not found on target_op,
+			'groups': [(group_name, parGroup, [entry index, ...]), ...] numeric
+				parameter groups whose components are all in entries
+		mask limits the plan to a parameter subset (see DefineMask); only the
+		subset is visited, its names being resolved once per preset and target.
+		"""
+		preset_data = self._preset_data(presetname)
+		entries = []
+		missing = []
+		# Parameters known to be absent on this parameter set are not looked up
+		# again; validation only runs once a lookup failed
+		known_missing = None
+
+		if mask is None:
+			items = preset_data.items()
+			group_names = self._detect_par_groups(presetname, target_op)
+		else:
+			names, group_names = self._resolve_mask(mask, presetname, target_op)
+			items = ((par_name, preset_data[par_name]) for par_name in names)
+
+		for par_name, par_value in items:
+			if known_missing is not None and par_name in known_missing:
+				missing.append(par_name)
+				continue
+			par = self._resolve_par(target_op, par_name)
+			if par is None:
+				missing.append(par_name)
+				if known_missing is None:
+					known_missing = self._validate_preset(presetname, target_op)['skip']
+				continue
+			entries.append((par_name, par, par_value, self._is_lerp_capable(target_op, par)))
+
+		# Parameter groups are applied as one unit with a single grouped write
+		entry_index = {entry[0]: i for i, entry in enumerate(entries)}
+		groups = []
+		for group_name, component_names in group_names:
+			indices = [entry_index.get(name) for name in component_names]
+			if None in indices or not all(entries[i][3] for i in indices):
+				continue
+			par_group = getattr(entries[indices[0]][1], 'parGroup', None)
+			if par_group is not None:
+				groups.append((group_name, par_group, indices))
+
+		return {
+			'preset': presetname,
+			'data': preset_data,
+			'target': target_op,
+			'entries': entries,
+			'missing': missing,
+			'groups': groups,
+		}
+
+	def _detect_par_groups(self, presetname, target_op):
+		"""
+		Detect parameter groups (e.g. Tx/Ty/Tz) among a preset's parameters.
+		Only groups whose components are all stored in the preset are returned.
+		Detected once per preset and target, then cached until the preset changes.
+		Returns [(group_name, [component par name, ...]), ...]
+		"""
+		self._check_library()
+		target_groups = self._preset_groups.setdefault(presetname, {})
+		groups = target_groups.get(target_op.path)
+		if groups is not None:
+			return groups
+
+		preset_data = self._read_preset_data(presetname)
+		groups = []
+		seen = set()
+		for par_name in preset_data.keys():
+			if par_name in seen:
+				continue
+			par = self._resolve_par(target_op, par_name)
+			tuplet = getattr(par, 'tuplet', None) if par is not None else None
+			if not tuplet or len(tuplet) < 2:
+				continue
+			component_names = [p.name for p in tuplet]
+			seen.update(component_names)
+			if all(name in preset_data for name in component_names):
+				groups.append((getattr(par, 'tupletName', component_names[0]), component_names))
+
+		target_groups[target_op.path] = groups
+		return groups
+
+	def _invalidate_preset_caches(self, presetname=None, renamed_to=None):
+		"""
+		Drop derived caches for a preset after it was saved, deleted or renamed.
+		presetname None drops the caches of all presets. renamed_to is the new
+		name of a renamed preset, so sharing instances can follow it.
+		Instances sharing the library drop theirs as well.
+		"""
+		self._drop_preset_caches(presetname)
+		if presetname is None:
+			self._remove_spill_files()
+		elif not self._is_spilled(presetname):
+			self._remove_spill_files(presetname)
+		self._notify_library_change(presetname, renamed_to)
+
+	def _drop_preset_caches(self, presetname=None):
+		"""Drop this instance's derived caches for a preset (None = all presets)."""
+		if presetname is None:
+			self._preset_groups = {}
+			self._mask_preset_cache = {}
+			self._validation_cache = {}
+			self._nearest_matrix = None
+			self._preset_sizes = {}
+			self._decoded_presets = {}
+			self._content_hashes = {}
+		else:
+			self._preset_groups.pop(presetname, None)
+			self._mask_preset_cache.pop(presetname, None)
+			self._validation_cache.pop(presetname, None)
+			self._update_nearest_row(presetname)
+			self._preset_sizes.pop(presetname, None)
+			self._decoded_presets.pop(presetname, None)
+			self._content_hashes.pop(presetname, None)
+
+	def _build_apply_plans(self, presetname, target_ops, mask=None):
+		"""
+		Build apply plans for several target OPs from one shared plan.
+		The preset is resolved, classified and grouped once against the first
+		target; the other targets only look up their parameters by name.
+		Targets are expected to be instances of the same COMP.
+		"""
+		template = self._build_apply_plan(presetname, target_ops[0], mask)
+		return [template] + [self._rebind_plan(template, target_op) for target_op in target_ops[1:]]
+
+	def _rebind_plan(self, template, target_op):
+		"""Return a copy of an apply plan bound to the parameters of another target OP."""
+		entries = []
+		missing = list(template['missing'])
+		index_map = {}
+
+		for i, (par_name, _par, par_value, is_numeric) in enumerate(template['entries']):
+			par = self._resolve_par(target_op, par_name)
+			if par is None:
+				missing.append(par_name)
+				continue
+			index_map[i] = len(entries)
+			entries.append((par_name, par, par_value, is_numeric))
+
+		groups = []
+		for group_name, _par_group, indices in template['groups']:
+			new_indices = [index_map.get(i) for i in indices]
+			if None in new_indices:
+				continue
+			par_group = getattr(entries[new_indices[0]][1], 'parGroup', None)
+			if par_group is not None:
+				groups.append((group_name, par_group, new_indices))
+
+		return {
+			'preset': template['preset'],
+			'data': template['data'],
+			'target': target_op,
+			'entries': entries,
+			'missing': missing,
+			'groups': groups,
+		}
+
+	def _plans_are_current(self, plans, target_ops):
+		"""Return True if plans were built for target_ops from the currently stored preset data."""
+		if not plans or [plan['target'] for plan in plans] != list(target_ops):
+			return False
+		presetname = plans[0]['preset']
+		return (presetname in self.Presets and not self._is_spilled(presetname)
+			and self._decode_preset(presetname, self.Presets[presetname]) is plans[0]['data'])
+
 	# ---------- Core Preset Functions ----------
 	def SavePreset(self, name=None):
 		"""
@@ -289,11 +955,16 @@ class presetterext:
 
 		# Store preset (need to copy dict for property accessor)
 		presets = dict(self.Presets)
-		presets[name] = pars_dict
+		presets[name] = self._encode_preset(name, pars_dict)
 		self.Presets = presets
+		self._invalidate_preset_caches(name)
+		self._cache_decoded_preset(name, presets[name], pars_dict)
 
 		# Update preset names list
-		self.UpdatePresetNames()
+		self._add_preset_name(name)
+		self._touch_preset(name)
+		self._record_change(('save', name, pars_dict))
+		self._enforce_memory_budget()
 
 		# Always set current preset to the newly saved one
 		self.CurrentPresetName = name
@@ -316,219 +987,848 @@ class presetterext:
 		self.UpdateInfo()
 		self.UpdateMenu()
 
-	def LoadPreset(self, presetname):
+	def LoadPreset(self, presetname, mask=None):
 		"""
-		Load preset values to the target OP.
+		Load preset values to the target OP (or every target in multi-target mode).
+		mask: optional parameter subset to apply (mask name, names/globs or
+			{'pars': ..., 'pages': ...}, see DefineMask)
 		"""
 		if not presetname or presetname not in self.Presets:
 			print(f"Warning: Preset '{presetname}' not found")
 			return False
 
-		# Get target OP
-		try:
-			target_op = self.ownerComp.par.Targetop.eval()
-		except Exception:
-			print("Warning: Targetop parameter not found or invalid")
+		# Get target OP(s)
+		target_ops = self._get_target_ops()
+		if not target_ops:
 			return False
 
-		if target_op is None:
-			print("Warning: Target OP is None")
-			return False
+		plans = self._build_apply_plans(presetname, target_ops, mask)
+		return self._load_plans(plans)
 
-		# Get preset data
-		preset_data = self.Presets[presetname]
+	def _load_plans(self, plans):
+		"""
+		Apply every value of resolved apply plans to their target OPs (instant load).
+		All plans belong to the same preset. Failures are reported per target in aggregate.
+		"""
+		presetname = plans[0]['preset']
 
 		# Apply each parameter value
 		success_count = 0
 		error_count = 0
+		target_errors = []
 
-		for par_name, par_value in preset_data.items():
-			try:
-				# Try to get parameter
-				par = target_op.par[par_name]
-				if par is None:
-					# Try alternative access
-					par = getattr(target_op.par, par_name, None)
+		for plan in plans:
+			plan_success = 0
+			plan_errors = len(plan['missing'])
+			entries = plan['entries']
 
-				if par is None:
-					error_count += 1
-					continue
+			# Parameter groups first, one write per group
+			grouped = set()
+			for group_name, par_group, indices in plan['groups']:
+				try:
+					par_group.val = tuple(self._convert_par_value(entries[i][1], entries[i][2]) for i in indices)
+					plan_success += len(indices)
+					grouped.update(indices)
+				except Exception:
+					# Fall back to per-component writes below
+					pass
 
-				# Set parameter value with proper type conversion
-				# Handle type mismatches (e.g., float value for int parameter)
+			for i, (par_name, par, par_value, _is_numeric) in enumerate(entries):
+				if i in grouped:
+					continue
 				try:
-					# Get parameter style/type
-					par_style = getattr(par, 'style', '').lower()
-					
-					# Convert value based on parameter type
-					if par_style == 'int':
-						# For int parameters, convert float/string to int
-						if isinstance(par_value, str):
-							# Try to parse string as float first, then convert to int
-							try:
-								par_value = int(round(float(par_value)))
-							except (ValueError, TypeError):
-								par_value = int(par_value)
-						elif isinstance(par_value, float):
-							par_value = int(round(par_value))
-						else:
-							par_value = int(par_value)
-					elif par_style == 'float':
-						# For float parameters, ensure it's a float
-						if isinstance(par_value, str):
-							par_value = float(par_value)
-						else:
-							par_value = float(par_value)
-					elif par_style == 'str':
-						# For string parameters, convert to string
-						par_value = str(par_value)
-					
-					par.val = par_value
-					success_count += 1
-				except (ValueError, TypeError) as e:
-					# If type conversion fails, try setting as-is
-					try:
-						par.val = par_value
-						success_count += 1
-					except Exception:
-						error_count += 1
+					self._set_par_value(par, par_value)
+					plan_success += 1
+				except Exception as e:
+					plan_errors += 1
+					if len(plans) == 1:
 						print(f"Warning: Could not set parameter '{par_name}' with value '{par_value}' (type: {type(par_value).__name__}): {e}")
 
-			except Exception as e:
-				error_count += 1
-				print(f"Warning: Could not set parameter '{par_name}': {e}")
-		
-		print(f"Loaded preset '{presetname}': {success_count} parameters set, {error_count} errors")
-		# Delay setting Has_changed to False and updating display
-		# This allows time for any parameter change callbacks to complete
-		def delayed_update():
-			self.Has_changed = False
-			self.UpdateInfo()
-		run(delayed_update, delayFrames=2)
-		# Also update immediately to show preset name
-		self.UpdateInfo()
+			success_count += plan_success
+			error_count += plan_errors
+			if plan_errors:
+				target_errors.append((plan['target'], plan_errors))
+
+		if len(plans) == 1:
+			print(f"Loaded preset '{presetname}': {success_count} parameters set, {error_count} errors")
+		else:
+			print(f"Loaded preset '{presetname}' onto {len(plans)} targets: {success_count} parameters set, {error_count} errors")
+			self._report_target_errors(target_errors)
+		# Clear Has_changed once parameter change callbacks have completed
+		self._mark_preset_applied()
 		return success_count > 0
 
-	def LoadPresetWithLerp(self, presetname, lerptime):
+	def _report_target_errors(self, target_errors):
+		"""Print one aggregated warning for targets that had errors: [(target_op, error_count), ...]"""
+		if not target_errors:
+			return
+		shown = ', '.join(f"{getattr(t, 'path', t)} ({n})" for t, n in target_errors[:10])
+		more = f" and {len(target_errors) - 10} more" if len(target_errors) > 10 else ''
+		print(f"Warning: {len(target_errors)} targets had errors: {shown}{more}")
+
+	def LoadPresetWithLerp(self, presetname, lerptime, easing=None, retarget=True, velocity=None, mask=None):
 		"""
 		Load preset values to the target OP with smooth interpolation over specified time.
 		Numeric parameters are interpolated, non-numeric parameters switch at the end.
 		Uses absTime.seconds for timing and Execute DAT for frame-based updates.
+		easing overrides the Lerpmethods parameter for this lerp (e.g. 'ease_in_out_sine').
+		In multi-target mode all targets are interpolated by the same lerp.
+		If a lerp is running and retarget is True, its current interpolated values
+		become the new start values without reading the target. velocity keeps the
+		running lerp's velocity for a smooth handoff (None uses the optional
+		Lerpvelocity parameter). mask limits the lerp to a parameter subset.
 		"""
+		# Accept Par objects (e.g. par.Lerptime) as well as numbers
+		lerptime = float(lerptime)
+
 		# Validate lerptime
 		if lerptime <= 0.001:
 			# Very small or zero time, fall back to instant load
-			return self.LoadPreset(presetname)
+			return self.LoadPreset(presetname, mask)
 
 		# Validate preset exists
 		if not presetname or presetname not in self.Presets:
 			print(f"Warning: Preset '{presetname}' not found")
 			return False
 
-		# Get target OP
-		try:
-			target_op = self.ownerComp.par.Targetop.eval()
-		except Exception:
-			print("Warning: Targetop parameter not found or invalid")
+		# Get target OP(s)
+		target_ops = self._get_target_ops()
+		if not target_ops:
 			return False
 
-		if target_op is None:
-			print("Warning: Target OP is None")
-			return False
+		if velocity is None:
+			try:
+				velocity = bool(self.ownerComp.par.Lerpvelocity.eval())
+			except Exception:
+				velocity = False
+
+		plans = self._build_apply_plans(presetname, target_ops, mask)
+		return self._load_plans_with_lerp(plans, lerptime, easing, retarget, velocity)
+
+	def _load_plans_with_lerp(self, plans, lerptime, easing=None, retarget=True, velocity=False):
+		"""
+		Start a lerp from the targets' current values to resolved apply plans.
+		Only current values are read here; parameter lookups were done by the plans.
+		When retargeting a running lerp, values it drives are taken from its
+		internal state instead of the target.
+		With several targets, channel names are prefixed with 'targetpath:'.
+		"""
+		lerptime = float(lerptime)
+		if lerptime <= 0.001:
+			return self._load_plans(plans)
+
+		presetname = plans[0]['preset']
 
-		# Cancel existing lerp if active
+		# Take over the running lerp's interpolated values (and velocities)
+		live_values = {}
+		live_velocities = {}
+		previous_preset = self.CurrentPresetName
 		if self._lerp_active:
-			# Read current parameter values from target OP (these become new start values)
-			# We'll capture these after cancelling
+			if retarget:
+				live_values, live_velocities = self._capture_lerp_state()
+				previous_preset = self._lerp_prev_preset
 			self._cancel_lerp()
 
-		# Get preset data
-		preset_data = self.Presets[presetname]
+		# Capture current parameter values from target OPs for all parameters in preset
+		packed, non_numeric_params = self._collect_lerp_values(plans, live_values)
 
-		# Capture current parameter values from target OP for all parameters in preset
-		start_values = {}
-		target_values = {}
-		non_numeric_params = {}
+		# Store lerp state
+		self._lerp_active = True
+		self._pack_lerp(packed)
+		self._reset_lerp_budget_stats()
+		self._lerp_output = self._get_lerp_output_mode()
+		self._lerp_non_numeric_params = non_numeric_params
+		self._lerp_start_time = absTime.seconds
+		self._lerp_duration = lerptime
+		self._lerp_target_ops = [plan['target'] for plan in plans]
+		self._lerp_easing = easing
+		self._lerp_prev_preset = previous_preset
+		# Staggered presets compile their timing into slot arrays once here
+		self._lerp_timing = self._compile_lerp_timing(presetname, lerptime)
+		if self._lerp_timing is not None:
+			self._lerp_duration = self._lerp_timing['duration']
+		if velocity and live_velocities:
+			# Hermite velocity term: value(t) += velocity * duration * t * (1 - t)^2
+			# matches the previous lerp's velocity at t=0 and vanishes at t=1
+			self._lerp_velocity_term = np.array(
+				[live_velocities.get(name, 0.0) for name in self._lerp_channel_names],
+				dtype=np.float64) * self._lerp_duration
+		self._resolve_lerp_priorities()
 
-		for par_name, par_value in preset_data.items():
-			try:
-				# Try to get parameter
-				par = target_op.par[par_name]
-				if par is None:
-					# Try alternative access
-					par = getattr(target_op.par, par_name, None)
+		# Enable Execute DAT if it exists
+		self._update_execute_active()
 
-				if par is None:
+		# Update current preset name
+		self.CurrentPresetName = presetname
+		self.UpdateInfo()
+
+		targets_info = f" on {len(plans)} targets" if len(plans) > 1 else ''
+		print(f"Started lerp to preset '{presetname}'{targets_info} over {self._lerp_duration} seconds ({len(self._lerp_writes)} numeric parameters, {len(non_numeric_params)} non-numeric)")
+		return True
+
+	def _collect_lerp_values(self, plans, live_values=None, par_filter=None):
+		"""
+		Collect start/target values of apply plans for packing into a lerp.
+		Start values come from live_values ({channel_name: value} of a running
+		lerp) when available, else from the target parameters.
+		par_filter optionally limits the parameters (set of parameter names).
+		Returns (packed, non_numeric_params) for _pack_values/_apply_non_numeric_params.
+		"""
+		live_values = live_values or {}
+		packed = []
+		non_numeric_params = []
+
+		for plan in plans:
+			if par_filter is not None:
+				plan = self._filter_plan(plan, par_filter)
+			entries = plan['entries']
+			prefix = f"{plan['target'].path}:" if len(plans) > 1 else ''
+
+			# Parameter groups are interpolated as one unit with a single grouped write
+			grouped = set()
+			for group_name, par_group, indices in plan['groups']:
+				channel_names = [prefix + entries[i][0] for i in indices]
+				starts = self._live_values(live_values, channel_names)
+				try:
+					if starts is None:
+						starts = [entries[i][1].eval() for i in indices]
+					targets = [entries[i][2] for i in indices]
+				except Exception:
 					continue
+				if all(isinstance(v, (int, float)) for v in starts + targets):
+					is_int = all(getattr(entries[i][1], 'style', '').lower() == 'int' for i in indices)
+					packed.append((group_name, par_group, starts, targets, channel_names, 'intseq' if is_int else 'seq'))
+					grouped.update(indices)
 
+			for i, (par_name, par, par_value, is_numeric) in enumerate(entries):
+				if i in grouped:
+					continue
 				# Check if parameter is numeric
-				if self._is_numeric_parameter(par):
+				if is_numeric:
+					if isinstance(par_value, (list, tuple)):
+						channel_names = [f'{prefix}{par_name}{c}' for c in range(len(par_value))]
+					else:
+						channel_names = [prefix + par_name]
 					# Capture current value as start value
 					try:
-						current_val = par.eval()
+						current_val = self._live_values(live_values, channel_names)
+						if current_val is None:
+							current_val = par.eval()
+						elif not isinstance(par_value, (list, tuple)):
+							current_val = current_val[0]
 						# Validate that we can interpolate between these values
 						# For multi-component values, ensure they're lists/tuples of same length
 						if isinstance(current_val, (list, tuple)) and isinstance(par_value, (list, tuple)):
 							if len(current_val) == len(par_value):
-								start_values[par_name] = current_val
-								target_values[par_name] = par_value
+								packed.append((par_name, par, current_val, par_value, channel_names, None))
 						elif isinstance(current_val, (int, float)) and isinstance(par_value, (int, float)):
-							start_values[par_name] = current_val
-							target_values[par_name] = par_value
+							packed.append((par_name, par, current_val, par_value, channel_names, None))
 					except Exception:
 						# Skip this parameter if we can't read current value
 						continue
 				else:
 					# Non-numeric parameter - store to apply at end
-					non_numeric_params[par_name] = par_value
+					non_numeric_params.append((par_name, par, par_value))
+
+		return packed, non_numeric_params
+
+	def _filter_plan(self, plan, par_names):
+		"""Return a copy of an apply plan limited to par_names, dropping incomplete groups."""
+		entries = []
+		index_map = {}
+		for i, entry in enumerate(plan['entries']):
+			if entry[0] in par_names:
+				index_map[i] = len(entries)
+				entries.append(entry)
+
+		groups = []
+		for group_name, par_group, indices in plan['groups']:
+			new_indices = [index_map.get(i) for i in indices]
+			if None not in new_indices:
+				groups.append((group_name, par_group, new_indices))
+		return dict(plan, entries=entries, groups=groups)
+
+	def _live_values(self, live_values, channel_names):
+		"""Return the running lerp's values for channel_names, or None if any is not driven by it."""
+		if not live_values:
+			return None
+		values = [live_values.get(name) for name in channel_names]
+		if None in values:
+			return None
+		return values
 
-			except Exception:
-				# Skip this parameter if we can't access it
-				continue
+	def _capture_lerp_state(self):
+		"""
+		Capture the running lerp's interpolated values and velocities at the current time.
+		Returns ({channel_name: value}, {channel_name: velocity per second}).
+		"""
+		progress = self._lerp_progress()
+		values = self._lerp_values_at(progress).tolist()
+
+		# Derivative of the eased progress, by central difference
+		easing_func = self._get_easing_function(self._get_lerp_easing_method())
+		lo = max(progress - 1e-4, 0.0)
+		hi = min(progress + 1e-4, 1.0)
+		rate = 0.0
+		if not self._lerp_paused and hi > lo:
+			rate = self._lerp_direction / self._lerp_duration
+		if self._lerp_timing is not None and hi > lo:
+			# Slots follow their own timing, differentiate the values directly
+			velocity = (self._lerp_values_at(hi) - self._lerp_values_at(lo)) * (rate / (hi - lo))
+		else:
+			ease_slope = (easing_func(hi) - easing_func(lo)) / (hi - lo) if hi > lo else 0.0
+			velocity = self._lerp_delta * (ease_slope * rate)
+			if self._lerp_velocity_term is not None:
+				# d/dt of t * (1 - t)^2 is (1 - t) * (1 - 3t)
+				velocity += self._lerp_velocity_term * ((1.0 - progress) * (1.0 - 3.0 * progress) * rate)
 
-		# Store lerp state
-		self._lerp_active = True
-		self._lerp_start_values = start_values
-		self._lerp_target_values = target_values
-		self._lerp_non_numeric_params = non_numeric_params
-		self._lerp_start_time = absTime.seconds
-		self._lerp_duration = lerptime
-		self._lerp_target_op = target_op
+		names = self._lerp_channel_names
+		return dict(zip(names, values)), dict(zip(names, velocity.tolist()))
 
-		# Enable Execute DAT if it exists
-		if self.lerp_execute is not None:
+	def _pack_lerp(self, packed):
+		"""
+		Pack numeric values into the main lerp's flat float arrays.
+		The output buffer is preallocated and reused as long as the number of
+		slots stays the same.
+		"""
+		values = self._pack_values(packed)
+		self._lerp_writes = values['writes']
+		self._lerp_start = values['start']
+		self._lerp_target = values['target']
+		self._lerp_delta = values['delta']
+		if self._lerp_buffer.size != self._lerp_start.size:
+			self._lerp_buffer = np.empty(self._lerp_start.size, dtype=np.float64)
+		self._lerp_buffer[:] = self._lerp_start
+		if values['channel_names'] != self._lerp_channel_names:
+			self._lerp_channel_names = values['channel_names']
+			self._lerp_layout_version += 1
+		self._lerp_seq = self._next_lerp_seq()
+
+	def _pack_values(self, packed):
+		"""
+		Pack numeric lerp start/target values into flat float arrays.
+		packed: [(par_name, par, start_value, target_value, channel_names, kind), ...]
+		par may be a ParGroup for grouped writes; channel_names and kind may be
+		None to derive them from the values and the parameter style.
+		Each parameter gets one slot per component.
+		Returns dict: 'writes' [(par_name, par, offset, width, kind), ...],
+			'start', 'target', 'delta' (float64 arrays), 'channel_names'
+		"""
+		writes = []
+		starts = []
+		targets = []
+		channel_names = []
+
+		for par_name, par, start_val, target_val, par_channels, kind in packed:
 			try:
-				self.lerp_execute.par.active = True
-			except Exception:
-				pass
+				if isinstance(start_val, (list, tuple)):
+					# Multi-component value (RGB, RGBA, XYZ, XYZW, parameter groups, etc.)
+					par_starts = [float(v) for v in start_val]
+					par_targets = [float(v) for v in target_val]
+					if par_channels is None:
+						par_channels = [f'{par_name}{i}' for i in range(len(par_starts))]
+					kind = kind or 'seq'
+				else:
+					par_starts = [float(start_val)]
+					par_targets = [float(target_val)]
+					if par_channels is None:
+						par_channels = [par_name]
+					# Check if parameter expects int (for int parameters)
+					kind = 'int' if getattr(par, 'style', '').lower() == 'int' else 'float'
+			except (ValueError, TypeError):
+				continue
 
-		# Update current preset name
-		self.CurrentPresetName = presetname
-		self.UpdateInfo()
+			writes.append((par_name, par, len(starts), len(par_starts), kind))
+			starts.extend(par_starts)
+			targets.extend(par_targets)
+			channel_names.extend(par_channels)
+
+		start = np.array(starts, dtype=np.float64)
+		target = np.array(targets, dtype=np.float64)
+		return {
+			'writes': writes,
+			'start': start,
+			'target': target,
+			'delta': target - start,
+			'channel_names': channel_names,
+		}
 
-		print(f"Started lerp to preset '{presetname}' over {lerptime} seconds ({len(start_values)} numeric parameters, {len(non_numeric_params)} non-numeric)")
-		return True
+	def _write_lerp_buffer(self, final=False):
+		"""
+		Write the lerp output buffer to the target parameters.
+		With a write budget only the parameters that fit are written, unless
+		final is set (the lerp lands on its end values this frame).
+		Returns the number of parameters that could not be set.
+		"""
+		budget = self._get_lerp_budget()
+		if budget is None:
+			return self._write_changed_values(self._lerp_write_index, self._lerp_buffer, self._lerp_written)
+		return self._write_budgeted_values(self._lerp_write_index, self._lerp_buffer,
+			self._lerp_written, None if final else budget)
+
+	def _lerp_moving_mask(self, start, target, velocity_term=None):
+		"""Return the slots of a lerp that can change: start differs from target, or velocity."""
+		moving = start != target
+		if velocity_term is not None:
+			moving |= velocity_term != 0.0
+		return moving
+
+	def _make_write_index(self, writes, moving):
+		"""
+		Prepare per-frame write suppression for owned writes.
+		moving is a bool array marking the slots that can change; writes
+		without any moving slot are excluded up front.
+		Returns dict: 'writes', 'starts'/'ends' (slot range per write),
+			'int_mask' (slots written as rounded ints), 'owned' (slots of the
+			kept writes), 'age' (frames each write was deferred by the budget)
+		"""
+		moving_count = np.concatenate(([0], np.cumsum(moving)))
+
+		kept = [w for w in writes if moving_count[w[2] + w[3]] - moving_count[w[2]] > 0]
+		int_mask = np.zeros(moving.size, dtype=bool)
+		owned = np.zeros(moving.size, dtype=bool)
+		for par_name, par, offset, width, kind in kept:
+			owned[offset:offset + width] = True
+			if kind in ('int', 'intseq'):
+				int_mask[offset:offset + width] = True
+		return {
+			'writes': kept,
+			'starts': np.array([w[2] for w in kept], dtype=np.int64),
+			'ends': np.array([w[2] + w[3] for w in kept], dtype=np.int64),
+			'int_mask': int_mask,
+			'owned': owned,
+			'age': np.zeros(len(kept), dtype=np.float64),
+		}
 
-	# ---------- Easing Functions ----------
-	def _ease_linear(self, t):
-		"""Linear interpolation (no easing)."""
-		return t
+	def _write_changed_values(self, write_index, buffer, written):
+		"""
+		Write only the parameters whose output value (rounded for ints) changed
+		since the previous frame. written holds the last written values and is
+		updated in place. Returns the number of parameters that could not be set.
+		"""
+		if write_index is None or not write_index['writes']:
+			return 0
 
-	def _ease_in_quad(self, t):
-		"""Quadratic ease in."""
-		return t * t
+		shown = np.where(write_index['int_mask'], np.rint(buffer), buffer)
+		changed = np.concatenate(([0], np.cumsum(shown != written)))
+		changed_writes = np.flatnonzero(changed[write_index['ends']] - changed[write_index['starts']])
+		written[:] = shown
+		if changed_writes.size == 0:
+			return 0
 
-	def _ease_out_quad(self, t):
-		"""Quadratic ease out."""
-		return t * (2.0 - t)
+		writes = write_index['writes']
+		return self._write_values([writes[i] for i in changed_writes.tolist()], buffer)
 
-	def _ease_in_out_quad(self, t):
-		"""Quadratic ease in-out."""
-		if t < 0.5:
-			return 2.0 * t * t
-		return -1.0 + (4.0 - 2.0 * t) * t
+	def _write_values(self, writes, buffer):
+		"""
+		Write packed values from buffer to parameters.
+		writes: [(par_name, par, offset, width, kind), ...] as built by _pack_values
+		Returns the number of parameters that could not be set.
+		"""
+		values = buffer.tolist()
+		error_count = 0
 
-	def _ease_in_cubic(self, t):
+		for par_name, par, offset, width, kind in writes:
+			try:
+				if kind == 'float':
+					# For float and parGroup components, set as float
+					# TouchDesigner will handle the conversion automatically
+					par.val = values[offset]
+				elif kind == 'int':
+					par.val = int(round(values[offset]))
+				elif kind == 'intseq':
+					par.val = tuple(int(round(v)) for v in values[offset:offset + width])
+				else:
+					par.val = tuple(values[offset:offset + width])
+			except Exception:
+				error_count += 1
+				# Silently continue - don't spam errors
+
+		return error_count
+
+	# ---------- Lerp Update Budget ----------
+	def SetLerpBudget(self, milliseconds):
+		"""
+		Set a per-frame time budget in milliseconds for the main lerp's parameter
+		writes (None or 0 disables it). When the changed parameters do not fit,
+		they are updated round-robin, the ones furthest from their current value
+		first; the final frame always writes every parameter so the lerp lands
+		exactly. Overrides the Lerpbudget parameter if it exists.
+		"""
+		self._lerp_budget = float(milliseconds) if milliseconds and milliseconds > 0 else 0.0
+		return True
+
+	def _get_lerp_budget(self):
+		"""Return the lerp write budget in seconds, or None when unlimited."""
+		budget_ms = self._lerp_budget
+		if budget_ms is None:
+			try:
+				budget_ms = self.ownerComp.par.Lerpbudget.eval()
+			except Exception:
+				return None
+		if budget_ms and budget_ms > 0:
+			return budget_ms / 1000.0
+		return None
+
+	def GetLerpBudgetStats(self):
+		"""
+		Return write budget instrumentation of the current (or last) main lerp:
+		budget_ms, write_cost_us (measured per parameter write), frames,
+		throttled_frames, update_ratio (parameters written / parameters changed,
+		last frame) and average_update_ratio (over the whole lerp).
+		"""
+		stats = self._lerp_budget_stats
+		budget = self._get_lerp_budget()
+		return {
+			'budget_ms': budget * 1000.0 if budget is not None else None,
+			'write_cost_us': self._lerp_write_cost * 1e6 if self._lerp_write_cost is not None else None,
+			'frames': stats['frames'],
+			'throttled_frames': stats['throttled_frames'],
+			'update_ratio': stats['update_ratio'],
+			'average_update_ratio': stats['written'] / stats['changed'] if stats['changed'] else 1.0,
+		}
+
+	def _reset_lerp_budget_stats(self):
+		"""Start new budget instrumentation (called when a main lerp starts)."""
+		self._lerp_budget_stats = {'frames': 0, 'throttled_frames': 0, 'update_ratio': 1.0,
+			'written': 0, 'changed': 0}
+
+	def _write_budgeted_values(self, write_index, buffer, written, budget=None):
+		"""
+		Write changed parameters within a time budget (seconds, None = all).
+		Changed writes are ranked by their largest slot difference to the last
+		written value, scaled by the frames they have been deferred, so every
+		parameter is reached round-robin. written is updated only for the
+		parameters actually written. Returns the number of parameters that
+		could not be set.
+		"""
+		if write_index is None or not write_index['writes']:
+			return 0
+
+		shown = np.where(write_index['int_mask'], np.rint(buffer), buffer)
+		diff = np.abs(shown - written)
+		# Never written slots (NaN) go first
+		diff[np.isnan(diff)] = np.inf
+		diff[~write_index['owned']] = 0.0
+		error = np.maximum.reduceat(diff, write_index['starts'])
+		changed_writes = np.flatnonzero(error > 0.0)
+		if changed_writes.size == 0:
+			return 0
+
+		stats = self._lerp_budget_stats
+		stats['frames'] += 1
+		age = write_index['age']
+		cost = self._lerp_write_cost or LERP_WRITE_COST
+		capacity = changed_writes.size
+		if budget is not None:
+			capacity = min(capacity, max(1, int(budget / cost)))
+		if capacity < changed_writes.size:
+			score = error[changed_writes] * (1.0 + age[changed_writes])
+			picked = changed_writes[np.argpartition(-score, capacity - 1)[:capacity]]
+			age[changed_writes] += 1.0
+			stats['throttled_frames'] += 1
+		else:
+			picked = changed_writes
+		age[picked] = 0.0
+
+		writes = write_index['writes']
+		picked_writes = [writes[i] for i in picked.tolist()]
+		for par_name, par, offset, width, kind in picked_writes:
+			written[offset:offset + width] = shown[offset:offset + width]
+
+		write_start = time.perf_counter()
+		error_count = self._write_values(picked_writes, buffer)
+		write_cost = (time.perf_counter() - write_start) / len(picked_writes)
+		# Smoothed cost per write, so one slow frame does not stall the lerp
+		if self._lerp_write_cost is None:
+			self._lerp_write_cost = write_cost
+		else:
+			self._lerp_write_cost += 0.2 * (write_cost - self._lerp_write_cost)
+
+		stats['update_ratio'] = len(picked_writes) / changed_writes.size
+		stats['written'] += len(picked_writes)
+		stats['changed'] += int(changed_writes.size)
+		return error_count
+
+	# ---------- Lerp Layers ----------
+	def StartLerpLayer(self, layer, presetname, lerptime, easing=None, pars=None, priority=1):
+		"""
+		Start a lerp on its own layer, running concurrently with the main lerp
+		and other layers (e.g. colors fading over 10 s while transforms snap).
+		layer: layer name; starting a layer again retargets it from its current values
+		pars: optional parameter subset (names or glob patterns), default all
+		priority: where layers drive the same parameter, the highest priority
+			wins (ties go to the most recently started); the main lerp has priority 0
+		Non-numeric parameters switch when the layer completes.
+		"""
+		if not presetname or presetname not in self.Presets:
+			print(f"Warning: Preset '{presetname}' not found")
+			return False
+
+		target_ops = self._get_target_ops()
+		if not target_ops:
+			return False
+
+		plans = self._build_apply_plans(presetname, target_ops)
+		par_filter = None
+		if pars is not None:
+			par_filter = self._match_par_names(plans[0]['data'].keys(), pars)
+
+		# Restarting a layer continues from its in-flight values
+		live_values = {}
+		old_layer = self._lerp_layers.pop(layer, None)
+		if old_layer is not None:
+			values = self._layer_values(old_layer, self._layer_progress(old_layer))
+			live_values = dict(zip(old_layer['channel_names'], values.tolist()))
+
+		packed, non_numeric_params = self._collect_lerp_values(plans, live_values, par_filter)
+		values = self._pack_values(packed)
+		values.update({
+			'preset': presetname,
+			'non_numeric': non_numeric_params,
+			'buffer': values['start'].copy(),
+			'start_time': absTime.seconds,
+			'duration': max(float(lerptime), 0.0),
+			'easing': easing,
+			'priority': priority,
+			'paused': False,
+			'paused_progress': 0.0,
+			'seq': self._next_lerp_seq(),
+			'active_writes': values['writes'],
+		})
+		self._lerp_layers[layer] = values
+		self._resolve_lerp_priorities()
+		self._update_execute_active()
+
+		print(f"Started lerp layer '{layer}' to preset '{presetname}' over {lerptime} seconds ({len(values['writes'])} numeric parameters, {len(non_numeric_params)} non-numeric)")
+		return True
+
+	def CancelLerpLayer(self, layer):
+		"""Stop a lerp layer where it is. Returns False if the layer is not running."""
+		if self._lerp_layers.pop(layer, None) is None:
+			return False
+		self._resolve_lerp_priorities()
+		self._update_execute_active()
+		return True
+
+	def CancelAllLerpLayers(self):
+		"""Stop all lerp layers where they are."""
+		self._lerp_layers = {}
+		self._resolve_lerp_priorities()
+		self._update_execute_active()
+
+	def PauseLerpLayer(self, layer):
+		"""Pause a lerp layer at its current values."""
+		state = self._lerp_layers.get(layer)
+		if state is None or state['paused']:
+			return False
+		state['paused_progress'] = self._layer_progress(state)
+		state['paused'] = True
+		return True
+
+	def ResumeLerpLayer(self, layer):
+		"""Resume a paused lerp layer."""
+		state = self._lerp_layers.get(layer)
+		if state is None or not state['paused']:
+			return False
+		state['start_time'] = absTime.seconds - state['paused_progress'] * state['duration']
+		state['paused'] = False
+		return True
+
+	def GetLerpLayers(self):
+		"""Return {layer name: info dict} for the running lerp layers."""
+		return {
+			layer: {
+				'preset': state['preset'],
+				'priority': state['priority'],
+				'progress': self._layer_progress(state),
+				'paused': state['paused'],
+				'parameters': len(state['writes']),
+				'owned_parameters': len(state['active_writes']),
+			}
+			for layer, state in self._lerp_layers.items()
+		}
+
+	def _match_par_names(self, par_names, patterns):
+		"""Return the set of par_names matching any of the names or glob patterns."""
+		import fnmatch
+
+		if isinstance(patterns, str):
+			patterns = patterns.split()
+		patterns = list(patterns)
+		exact = {p for p in patterns if not any(c in p for c in '*?[')}
+		globs = [p for p in patterns if p not in exact]
+		return {name for name in par_names if name in exact or any(fnmatch.fnmatchcase(name, g) for g in globs)}
+
+	def _next_lerp_seq(self):
+		"""Return an increasing start order number for priority ties."""
+		self._lerp_seq_counter += 1
+		return self._lerp_seq_counter
+
+	def _layer_progress(self, state):
+		"""Return a layer's raw progress in [0, 1]."""
+		if state['paused']:
+			return state['paused_progress']
+		if state['duration'] <= 0.0:
+			return 1.0
+		return min(max((absTime.seconds - state['start_time']) / state['duration'], 0.0), 1.0)
+
+	def _layer_values(self, state, t_raw, out=None):
+		"""Compute a layer's interpolated values at raw progress t_raw."""
+		if out is None:
+			out = np.empty_like(state['start'])
+		easing_method = state['easing'] or self._get_lerp_easing_method()
+		return self._interpolate_into(out, state['start'], state['delta'], state['target'], t_raw, easing_method)
+
+	def _resolve_lerp_priorities(self):
+		"""
+		Assign every parameter to the lerp that drives it with the highest priority
+		(ties: most recently started). Each lerp only writes the parameters it owns.
+		"""
+		if not self._lerp_layers:
+			self._lerp_active_writes = self._lerp_writes
+			self._index_main_lerp_writes()
+			return
+
+		lerps = [(state['priority'], state['seq'], state) for state in self._lerp_layers.values()]
+		if self._lerp_active:
+			main = {'writes': self._lerp_writes, 'channel_names': self._lerp_channel_names}
+			lerps.append((self._lerp_priority, self._lerp_seq, main))
+		else:
+			main = None
+		lerps.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+		claimed = set()
+		for _priority, _seq, state in lerps:
+			names = state['channel_names']
+			state['active_writes'] = [
+				write for write in state['writes']
+				if not any(name in claimed for name in names[write[2]:write[2] + write[3]])
+			]
+			claimed.update(names)
+
+		for state in self._lerp_layers.values():
+			state['write_index'] = self._make_write_index(
+				state['active_writes'], self._lerp_moving_mask(state['start'], state['target']))
+			# Ownership changed, write everything owned on the next frame
+			state['written'] = np.full(state['start'].size, np.nan)
+
+		self._lerp_active_writes = main['active_writes'] if main is not None else []
+		self._index_main_lerp_writes()
+
+	def _index_main_lerp_writes(self):
+		"""Rebuild the main lerp's write suppression index after its owned writes changed."""
+		if not self._lerp_active or self._lerp_start is None:
+			self._lerp_write_index = None
+			self._lerp_written = None
+			return
+		self._lerp_write_index = self._make_write_index(self._lerp_active_writes,
+			self._lerp_moving_mask(self._lerp_start, self._lerp_target, self._lerp_velocity_term))
+		self._lerp_written = np.full(self._lerp_start.size, np.nan)
+
+	def _advance_lerp_layers(self):
+		"""Advance all lerp layers: one vectorized fill per layer, then one batched write pass."""
+		finished = []
+		for layer, state in self._lerp_layers.items():
+			if state['paused']:
+				continue
+			t_raw = self._layer_progress(state)
+			self._layer_values(state, t_raw, out=state['buffer'])
+			self._write_changed_values(state['write_index'], state['buffer'], state['written'])
+			if t_raw >= 1.0:
+				finished.append(layer)
+
+		for layer in finished:
+			state = self._lerp_layers.pop(layer)
+			self._apply_values(state['non_numeric'])
+			print(f"Lerp layer '{layer}' completed")
+
+		if finished:
+			self._resolve_lerp_priorities()
+			self._update_execute_active()
+
+	# ---------- Lerp Channel Output ----------
+	def SetLerpOutputMode(self, mode):
+		"""
+		Set how lerps output their interpolated values:
+		'pars' - write each target parameter every frame (default)
+		'channels' - only fill the channel buffer; a Script CHOP calling
+			CookLerpChop() exposes it as named channels, e.g. for a CHOP export
+		None - use the Lerpoutput parameter if it exists.
+		Takes effect with the next lerp.
+		"""
+		if mode not in (None, 'pars', 'channels'):
+			print(f"Warning: Unknown lerp output mode '{mode}'")
+			return False
+		self._lerp_output_mode = mode
+		return True
+
+	def _get_lerp_output_mode(self):
+		"""Return the active lerp output mode ('pars' or 'channels')."""
+		mode = self._lerp_output_mode
+		if mode is None:
+			try:
+				mode = self.ownerComp.par.Lerpoutput.eval()
+			except Exception:
+				mode = 'pars'
+		return 'channels' if mode == 'channels' else 'pars'
+
+	def GetLerpChannelNames(self):
+		"""Return the channel names of the lerp buffer (one per value component)."""
+		return list(self._lerp_channel_names)
+
+	def GetLerpChannelBuffer(self):
+		"""Return the lerp output buffer (float64 numpy array, one value per channel)."""
+		return self._lerp_buffer
+
+	def CookLerpChop(self, scriptOp):
+		"""
+		Fill a Script CHOP with the lerp channel buffer.
+		Call from the Script CHOP's onCook(scriptOp) callback. Channels are
+		only rebuilt when the lerp layout changes; otherwise the cook is one
+		array copy.
+		"""
+		names = self._lerp_channel_names
+		if self._chop_layout_version != self._lerp_layout_version or scriptOp.numChans != len(names):
+			scriptOp.clear()
+			scriptOp.numSamples = 1
+			for name in names:
+				scriptOp.appendChan(name)
+			self._chop_buffer = np.empty((len(names), 1), dtype=np.float32)
+			self._chop_layout_version = self._lerp_layout_version
+
+		if names:
+			self._chop_buffer[:, 0] = self._lerp_buffer
+			scriptOp.copyNumpyArray(self._chop_buffer)
+
+	def _cook_lerp_chop(self):
+		"""Force the lerp Script CHOP to cook so it picks up the new buffer values."""
+		if self.lerp_chop is not None:
+			try:
+				self.lerp_chop.cook(force=True)
+			except Exception:
+				pass
+
+	# ---------- Easing Functions ----------
+	def _ease_linear(self, t):
+		"""Linear interpolation (no easing)."""
+		return t
+
+	def _ease_in_quad(self, t):
+		"""Quadratic ease in."""
+		return t * t
+
+	def _ease_out_quad(self, t):
+		"""Quadratic ease out."""
+		return t * (2.0 - t)
+
+	def _ease_in_out_quad(self, t):
+		"""Quadratic ease in-out."""
+		if t < 0.5:
+			return 2.0 * t * t
+		return -1.0 + (4.0 - 2.0 * t) * t
+
+	def _ease_in_cubic(self, t):
 		"""Cubic ease in."""
 		return t * t * t
 
@@ -704,8 +2004,13 @@ class presetterext:
 	def _get_easing_function(self, method_name):
 		"""
 		Get the easing function by method name.
+		Custom curves (DefineBezierEasing, DefineTableEasing) are looked up first.
 		Returns the easing function, or linear if method not found.
 		"""
+		if method_name in self.Curves:
+			entry = self._curve_entry(method_name)
+			if entry is not None:
+				return entry['func']
 		easing_map = {
 			'linear': self._ease_linear,
 			'ease_in_quad': self._ease_in_quad,
@@ -741,12 +2046,213 @@ class presetterext:
 		}
 		return easing_map.get(method_name, self._ease_linear)
 
+	# ---------- Custom Easing Curves ----------
+	def DefineBezierEasing(self, name, x1, y1, x2, y2):
+		"""
+		Define an easing curve from cubic-bezier control points, as in CSS
+		cubic-bezier(x1, y1, x2, y2). x1 and x2 are clamped to [0, 1].
+		The curve can be used wherever an easing method name is accepted.
+		"""
+		points = [min(max(float(x1), 0.0), 1.0), float(y1), min(max(float(x2), 0.0), 1.0), float(y2)]
+		return self._store_curve(name, {'type': 'bezier', 'points': points})
+
+	def DefineTableEasing(self, name, values, channel=0, normalize=True):
+		"""
+		Define an easing curve from sampled values.
+		values: list of y values (evenly spaced over [0, 1]) or (x, y) pairs, or
+			a CHOP, DAT or Animation COMP (OP or path) read whenever it cooks:
+			CHOP channel (index or name), DAT rows of y or x y, or the
+			Animation COMP's out1 CHOP
+		normalize: rescale so the curve starts at 0 and ends at 1
+		"""
+		if isinstance(values, str) or hasattr(values, 'path'):
+			source = values if isinstance(values, str) else values.path
+			spec = {'type': 'op', 'op': source, 'channel': channel, 'normalize': bool(normalize)}
+		else:
+			values = [list(map(float, v)) if isinstance(v, (list, tuple)) else float(v) for v in values]
+			values = self._curve_samples(values, name)
+			if values is None:
+				return False
+			spec = {'type': 'table', 'values': values, 'normalize': bool(normalize)}
+		return self._store_curve(name, spec)
+
+	def DeleteEasing(self, name):
+		"""Delete a custom easing curve."""
+		if name not in self.Curves:
+			print(f"Warning: Easing curve '{name}' not found")
+			return False
+		curves = dict(self.Curves)
+		del curves[name]
+		self.Curves = curves
+		self._curve_luts.pop(name, None)
+		return True
+
+	def GetCustomEasingNames(self):
+		"""Return the names of the custom easing curves."""
+		return sorted(self.Curves)
+
+	def _store_curve(self, name, spec):
+		"""Store a curve definition and drop its sampled lookup table."""
+		if not name or name == 'linear' or (name.startswith('ease_') and hasattr(self, '_' + name)):
+			print(f"Warning: Easing name '{name}' is invalid or built in")
+			return False
+		curves = dict(self.Curves)
+		curves[name] = spec
+		self.Curves = curves
+		self._curve_luts.pop(name, None)
+		return True
+
+	def _curve_entry(self, name):
+		"""
+		Return the sampled entry of a custom curve: {'lut' (float64 array of
+		EASING_LUT_SIZE + 1 samples), 'func' (scalar easing function), ...}.
+		The curve is resampled when its definition changes or its source OP
+		cooked; that check runs at most once per frame.
+		"""
+		spec = self.Curves.get(name)
+		if spec is None:
+			return None
+		frame = absTime.frame
+		entry = self._curve_luts.get(name)
+		if entry is not None:
+			if entry['frame'] == frame:
+				return entry
+			if entry['spec'] == spec and entry['signature'] == self._curve_signature(spec):
+				entry['frame'] = frame
+				return entry
+
+		lut = self._sample_curve(spec)
+		if lut is None:
+			print(f"Warning: Could not sample easing curve '{name}', using linear")
+			lut = np.linspace(0.0, 1.0, EASING_LUT_SIZE + 1)
+		entry = {
+			'frame': frame,
+			'spec': dict(spec),
+			'signature': self._curve_signature(spec),
+			'lut': lut,
+			'func': self._make_curve_function(lut.tolist()),
+		}
+		self._curve_luts[name] = entry
+		return entry
+
+	def _make_curve_function(self, samples):
+		"""Return a scalar easing function reading a lookup table (one linear interpolation)."""
+		scale = float(EASING_LUT_SIZE)
+		last = EASING_LUT_SIZE
+
+		def ease(t):
+			if t <= 0.0:
+				return samples[0]
+			if t >= 1.0:
+				return samples[last]
+			x = t * scale
+			i = int(x)
+			return samples[i] + (samples[i + 1] - samples[i]) * (x - i)
+		return ease
+
+	def _curve_signature(self, spec):
+		"""Return a value that changes when the source OP of a curve cooks (None for static curves)."""
+		if spec.get('type') != 'op':
+			return None
+		source = op(spec.get('op'))
+		if source is None:
+			return None
+		return (source.path, getattr(source, 'totalCooks', None))
+
+	def _sample_curve(self, spec):
+		"""Sample a curve definition into EASING_LUT_SIZE + 1 values over [0, 1], or None."""
+		grid = np.linspace(0.0, 1.0, EASING_LUT_SIZE + 1)
+		curve_type = spec.get('type')
+		if curve_type == 'bezier':
+			# Solve x(s) = t by dense sampling of the monotonic x(s), then interpolate y
+			x1, y1, x2, y2 = spec['points']
+			s = np.linspace(0.0, 1.0, 8 * EASING_LUT_SIZE + 1)
+			a = 3.0 * (1.0 - s) * (1.0 - s) * s
+			b = 3.0 * (1.0 - s) * s * s
+			c = s * s * s
+			return np.interp(grid, a * x1 + b * x2 + c, a * y1 + b * y2 + c)
+
+		if curve_type == 'table':
+			values = spec.get('values') or []
+		elif curve_type == 'op':
+			values = self._read_curve_source(spec.get('op'), spec.get('channel', 0))
+		else:
+			return None
+		if not values:
+			return None
+
+		if isinstance(values[0], (list, tuple)):
+			pairs = sorted((float(x), float(y)) for x, y in values)
+			xs = np.array([x for x, y in pairs], dtype=np.float64)
+			ys = np.array([y for x, y in pairs], dtype=np.float64)
+			if xs[-1] > xs[0]:
+				xs = (xs - xs[0]) / (xs[-1] - xs[0])
+		else:
+			ys = np.array(values, dtype=np.float64)
+			xs = np.linspace(0.0, 1.0, ys.size)
+		lut = np.interp(grid, xs, ys) if ys.size > 1 else np.full(grid.size, ys[0])
+		if spec.get('normalize', True) and lut[-1] != lut[0]:
+			lut = (lut - lut[0]) / (lut[-1] - lut[0])
+		return lut
+
+	def _read_curve_source(self, path, channel=0):
+		"""Read curve samples from a CHOP channel, a DAT (y or x y rows) or an Animation COMP."""
+		source = op(path)
+		if source is None:
+			return None
+		try:
+			if source.isCOMP:
+				source = source.op('out1')
+				if source is None:
+					return None
+			if source.isCHOP:
+				return source[channel].numpyArray().tolist()
+			if source.isDAT:
+				values = []
+				for r in range(source.numRows):
+					try:
+						row = [float(cell.val) for cell in source.row(r)[:2]]
+					except (ValueError, TypeError):
+						continue  # header row
+					if row:
+						values.append(row if len(row) == 2 else row[0])
+				return self._curve_samples(values, source.path)
+		except Exception:
+			return None
+		return None
 
+	def _curve_samples(self, values, source):
+		"""Return curve samples if they are all y values or all (x, y) pairs, else None with a warning."""
+		pairs = [isinstance(value, (list, tuple)) for value in values]
+		if (any(pairs) and not all(pairs)) or any(len(value) != 2 for value in values if isinstance(value, (list, tuple))):
+			print(f"Warning: Easing curve '{source}' needs all y values or all (x, y) pairs, ignored")
+			return None
+		return values
 
 	def _update_lerp(self):
 		"""
-		Polling-based update function for lerp interpolation.
-		Called by Execute DAT each frame when lerp is active.
+		Polling-based per-frame update.
+		Called by Execute DAT each frame while a lerp, a lerp layer or the sequencer is active.
+		Runs queued remote commands, advances the active lerp, the lerp layers, then the sequencer.
+		"""
+		if self._remote_queue:
+			self._drain_remote_commands()
+		if self._sync_thread is not None:
+			self._update_sync()
+		if self._lerp_active and not self._lerp_paused:
+			self._advance_lerp()
+		if self._lerp_layers:
+			self._advance_lerp_layers()
+		if self._blend_weight_source is not None:
+			self._poll_blend_weight_source()
+		if self._path_playing:
+			self._advance_path()
+		if self._seq_playing:
+			self._update_sequencer()
+
+	def _advance_lerp(self):
+		"""
+		Advance the active lerp by one frame.
 		Uses absTime.seconds to calculate progress and update parameters.
 		"""
 		# Check if lerp is still active (might have been cancelled)
@@ -754,162 +2260,207 @@ class presetterext:
 			return
 
 		# Check if target OP is still valid
-		if self._lerp_target_op is None:
+		if not self._lerp_target_ops:
 			self._cancel_lerp()
 			return
 
-		# Validate target OP is still accessible
-		try:
-			_ = self._lerp_target_op.par
-		except Exception:
+		# Validate target OP is still accessible (writes to single invalid
+		# targets in multi-target mode just fail silently)
+		if not any(self._is_op_accessible(target_op) for target_op in self._lerp_target_ops):
 			# Target OP is no longer valid
 			print("Warning: Target OP became invalid during lerp, cancelling")
 			self._cancel_lerp()
 			return
 
-		# Calculate elapsed time and progress using absTime.seconds
+		# Calculate progress using absTime.seconds
+		t_raw = self._lerp_progress()
+
+		# Fill the output buffer with the interpolated values in one vectorized step
+		self._lerp_values_at(t_raw, out=self._lerp_buffer)
+
+		if self._lerp_output == 'channels':
+			self._cook_lerp_chop()
+		else:
+			self._write_lerp_buffer(final=t_raw >= 1.0 or t_raw <= 0.0)
+
+		# Check if lerp is complete
+		if t_raw >= 1.0 and self._lerp_direction > 0:
+			# Lerp complete - apply non-numeric parameters and cleanup
+			self._apply_non_numeric_params()
+			self._complete_lerp()
+		elif t_raw <= 0.0 and self._lerp_direction < 0:
+			# Reversed lerp is back at its start values, the preset was not applied
+			self.CurrentPresetName = self._lerp_prev_preset
+			self._complete_lerp()
+
+	def _get_lerp_easing_method(self):
+		"""Return the easing method name of the active lerp (per-lerp override, else Lerpmethods, else linear)."""
+		easing_method = self._lerp_easing
+		if easing_method is None:
+			easing_method = 'linear'
+			try:
+				lerp_method_par = self.ownerComp.par.Lerpmethods
+				if lerp_method_par is not None:
+					easing_method = lerp_method_par.eval()
+			except Exception:
+				pass
+		return easing_method
+
+	def _lerp_progress(self):
+		"""Return the active lerp's raw (uneased) progress in [0, 1]."""
+		if self._lerp_paused:
+			return self._lerp_progress_origin
 		elapsed = absTime.seconds - self._lerp_start_time
-		t_raw = min(elapsed / self._lerp_duration, 1.0)
-		
-		# Get easing method from parameter (default to linear if not set)
-		easing_method = 'linear'
-		try:
-			lerp_method_par = self.ownerComp.par.Lerpmethods
-			if lerp_method_par is not None:
-				easing_method = lerp_method_par.eval()
-		except Exception:
-			pass
-		
+		progress = self._lerp_progress_origin + self._lerp_direction * elapsed / self._lerp_duration
+		return min(max(progress, 0.0), 1.0)
+
+	def _lerp_values_at(self, t_raw, out=None):
+		"""
+		Compute the interpolated lerp values at raw progress t_raw.
+		Writes into out if given (e.g. the output buffer), else a new array.
+		"""
+		if out is None:
+			out = np.empty_like(self._lerp_start)
+		if self._lerp_timing is not None:
+			return self._interpolate_timed_into(out, t_raw)
+		return self._interpolate_into(out, self._lerp_start, self._lerp_delta, self._lerp_target,
+			t_raw, self._get_lerp_easing_method(), self._lerp_velocity_term)
+
+	def _interpolate_into(self, out, start, delta, target, t_raw, easing_method, velocity_term=None):
+		"""
+		Fill out with start + delta * ease(t_raw) in one vectorized step
+		(plus the optional Hermite velocity term). Returns out.
+		"""
+		if t_raw >= 1.0:
+			# Land exactly on the target values
+			out[:] = target
+			return out
+		if t_raw <= 0.0:
+			out[:] = start
+			return out
+
 		# Apply easing function to t
 		easing_func = self._get_easing_function(easing_method)
 		t = easing_func(t_raw)
 
-		# Apply interpolated values to numeric parameters
-		success_count = 0
-		error_count = 0
-
-		for par_name in self._lerp_start_values.keys():
-			try:
-				# Get parameter reference
-				par = self._lerp_target_op.par[par_name]
-				if par is None:
-					par = getattr(self._lerp_target_op.par, par_name, None)
-
-				if par is None:
-					error_count += 1
-					continue
+		np.multiply(delta, t, out=out)
+		out += start
+		if velocity_term is not None:
+			out += velocity_term * (t_raw * (1.0 - t_raw) * (1.0 - t_raw))
+		return out
 
-				# Get start and target values
-				start_val = self._lerp_start_values[par_name]
-				target_val = self._lerp_target_values[par_name]
+	def _interpolate_timed_into(self, out, t_raw):
+		"""
+		Fill out with the active lerp's values when slots have their own timing.
+		Each slot's local progress is clip(t_raw * scale - offset, 0, 1), eased
+		through the sampled curve of its easing group. Returns out.
+		"""
+		if t_raw >= 1.0:
+			out[:] = self._lerp_target
+			return out
+		if t_raw <= 0.0:
+			out[:] = self._lerp_start
+			return out
+
+		timing = self._lerp_timing
+		local = timing['local']
+		np.multiply(timing['scale'], t_raw, out=local)
+		local -= timing['offset']
+		np.clip(local, 0.0, 1.0, out=local)
+		grid = timing['grid']
+		for easing_method, slots in timing['groups']:
+			lut = self._easing_lut(easing_method or self._get_lerp_easing_method())
+			if slots is None:
+				local[:] = np.interp(local, grid, lut)
+			else:
+				local[slots] = np.interp(local[slots], grid, lut)
+
+		np.multiply(self._lerp_delta, local, out=out)
+		out += self._lerp_start
+		if self._lerp_velocity_term is not None:
+			out += self._lerp_velocity_term * (t_raw * (1.0 - t_raw) * (1.0 - t_raw))
+		return out
+
+	def _easing_lut(self, easing_method):
+		"""Return the easing curve sampled at EASING_LUT_SIZE + 1 points in [0, 1] (cached)."""
+		if easing_method in self.Curves:
+			entry = self._curve_entry(easing_method)
+			if entry is not None:
+				return entry['lut']
+		lut = self._easing_luts.get(easing_method)
+		if lut is None:
+			easing_func = self._get_easing_function(easing_method)
+			lut = np.array([easing_func(i / EASING_LUT_SIZE) for i in range(EASING_LUT_SIZE + 1)],
+				dtype=np.float64)
+			self._easing_luts[easing_method] = lut
+		return lut
+
+	# ---------- Lerp Transport ----------
+	def PauseLerp(self):
+		"""Pause the active lerp at its current values."""
+		if not self._lerp_active or self._lerp_paused:
+			return False
+		self._lerp_progress_origin = self._lerp_progress()
+		self._lerp_paused = True
+		return True
 
-				# Interpolate based on value type (works for both regular params and parGroup components)
-				try:
-					# Check if values are single numbers or multi-component
-					if isinstance(start_val, (int, float)) and isinstance(target_val, (int, float)):
-						# Single numeric value interpolation (works for float, int, and parGroup components)
-						start_float = float(start_val)
-						target_float = float(target_val)
-						interp_val = start_float + (target_float - start_float) * t
-						
-						# Check if parameter expects int (for int parameters)
-						par_style = getattr(par, 'style', '').lower()
-						if par_style == 'int':
-							par.val = int(round(interp_val))
-						else:
-							# For float and parGroup components, set as float
-							# TouchDesigner will handle the conversion automatically
-							par.val = interp_val
-						success_count += 1
-						
-					elif isinstance(start_val, (list, tuple)) and isinstance(target_val, (list, tuple)):
-						# Multi-component interpolation (RGB, RGBA, XYZ, XYZW, etc.)
-						if len(start_val) == len(target_val):
-							try:
-								interp_vals = [float(start_val[i]) + (float(target_val[i]) - float(start_val[i])) * t for i in range(len(start_val))]
-								par.val = tuple(interp_vals)
-								success_count += 1
-							except (ValueError, TypeError):
-								error_count += 1
-						else:
-							error_count += 1
-					else:
-						# Mismatched types - try to convert both to float
-						try:
-							start_float = float(start_val)
-							target_float = float(target_val)
-							interp_val = start_float + (target_float - start_float) * t
-							par.val = interp_val
-							success_count += 1
-						except (ValueError, TypeError):
-							error_count += 1
+	def ResumeLerp(self):
+		"""Resume a paused lerp from where it was paused."""
+		if not self._lerp_active or not self._lerp_paused:
+			return False
+		self._lerp_start_time = absTime.seconds
+		self._lerp_paused = False
+		return True
 
-				except Exception:
-					error_count += 1
-					# Silently continue - don't spam errors
+	def ReverseLerp(self):
+		"""
+		Reverse the direction of the active lerp from its current position.
+		A lerp reversed back to its start ends without applying the preset.
+		"""
+		if not self._lerp_active:
+			return False
+		self._lerp_progress_origin = self._lerp_progress()
+		self._lerp_start_time = absTime.seconds
+		self._lerp_direction = -self._lerp_direction
+		return True
 
-			except Exception:
-				error_count += 1
-				# Silently continue
+	def GetLerpState(self):
+		"""Return a dict describing the active lerp."""
+		return {
+			'active': self._lerp_active,
+			'paused': self._lerp_paused,
+			'direction': int(self._lerp_direction),
+			'progress': self._lerp_progress() if self._lerp_active else 0.0,
+			'duration': self._lerp_duration,
+			'parameters': len(self._lerp_writes),
+		}
 
-		# Check if lerp is complete
-		if t >= 1.0:
-			# Lerp complete - apply non-numeric parameters and cleanup
-			self._apply_non_numeric_params()
-			self._complete_lerp()
+	def _is_op_accessible(self, target_op):
+		"""Return True if target_op still exists and its parameters can be accessed."""
+		try:
+			_ = target_op.par
+			return True
+		except Exception:
+			return False
 
 	def _apply_non_numeric_params(self):
 		"""
 		Apply non-numeric parameters (strings, menus, toggles) at the end of lerp.
 		"""
-		if self._lerp_target_op is None:
+		if not self._lerp_target_ops:
 			return
+		self._apply_values(self._lerp_non_numeric_params)
 
+	def _apply_values(self, params):
+		"""Apply [(par_name, par, value), ...] with type conversion."""
 		success_count = 0
 		error_count = 0
 
-		for par_name, par_value in self._lerp_non_numeric_params.items():
+		for par_name, par, par_value in params:
+			# Apply value with type conversion (same logic as LoadPreset)
 			try:
-				# Try to get parameter
-				par = self._lerp_target_op.par[par_name]
-				if par is None:
-					par = getattr(self._lerp_target_op.par, par_name, None)
-
-				if par is None:
-					error_count += 1
-					continue
-
-				# Apply value with type conversion (same logic as LoadPreset)
-				try:
-					par_style = getattr(par, 'style', '').lower()
-
-					if par_style == 'int':
-						if isinstance(par_value, str):
-							try:
-								par_value = int(round(float(par_value)))
-							except (ValueError, TypeError):
-								par_value = int(par_value)
-						elif isinstance(par_value, float):
-							par_value = int(round(par_value))
-						else:
-							par_value = int(par_value)
-					elif par_style == 'float':
-						if isinstance(par_value, str):
-							par_value = float(par_value)
-						else:
-							par_value = float(par_value)
-					elif par_style == 'str':
-						par_value = str(par_value)
-
-					par.val = par_value
-					success_count += 1
-				except (ValueError, TypeError) as e:
-					try:
-						par.val = par_value
-						success_count += 1
-					except Exception:
-						error_count += 1
-
+				self._set_par_value(par, par_value)
+				success_count += 1
 			except Exception:
 				error_count += 1
 
@@ -921,11 +2472,7 @@ class presetterext:
 		Complete the lerp process - cleanup and update state.
 		"""
 		# Reset Has_changed since we just loaded the preset
-		def delayed_update():
-			self.Has_changed = False
-			self.UpdateInfo()
-		run(delayed_update, delayFrames=2)
-		self.UpdateInfo()
+		self._mark_preset_applied()
 
 		# Clear lerp state and disable Execute DAT
 		self._cancel_lerp()
@@ -944,9 +2491,15 @@ class presetterext:
 		presets = dict(self.Presets)
 		del presets[presetname]
 		self.Presets = presets
+		self._invalidate_preset_caches(presetname)
+		if presetname in self.Timings:
+			timings = dict(self.Timings)
+			del timings[presetname]
+			self.Timings = timings
 
 		# Update preset names list
-		self.UpdatePresetNames()
+		self._remove_preset_name(presetname)
+		self._record_change(('delete', presetname))
 
 		# Clear current preset if it was deleted
 		if self.CurrentPresetName == presetname:
@@ -967,8 +2520,11 @@ class presetterext:
 			print("No presets to delete")
 			return False
 
-		# Clear all presets
+		# Clear all presets (recorded first, the record versions every cleared name)
+		self._record_change(('clear',))
 		self.Presets = {}
+		self.Timings = {}
+		self._invalidate_preset_caches()
 
 		# Clear current preset name
 		self.CurrentPresetName = None
@@ -981,55 +2537,2634 @@ class presetterext:
 		print(f"Deleted all {preset_count} presets")
 		return True
 
-	# ---------- Callback Handlers ----------
-	def OnPresetmenu(self, par):
-		"""Callback for Presetmenu - updates CurrentPresetName and loads preset when menu selection changes."""
-		try:
-			menu_val = par.eval()
-			if menu_val and menu_val != 'None':
-				# Update CurrentPresetName to match menu selection
-				self.CurrentPresetName = menu_val
-				# Check if Lerp toggle is enabled
-				try:
-					lerp_enabled = self.ownerComp.par.Lerp.eval()
-					if lerp_enabled:
-						# Get lerp time and use lerp loading
-						lerptime = self.ownerComp.par.Lerptime
-						self.LoadPresetWithLerp(menu_val, lerptime)
-					else:
-						# Load the preset values to target OP (instant)
-						self.LoadPreset(menu_val)
-				except Exception:
-					# Lerp parameters might not exist, fall back to instant load
-					self.LoadPreset(menu_val)
-			else:
-				# 'None' selected
-				self.CurrentPresetName = None
-				self.UpdateInfo()
-		except Exception as e:
-			print(f"Warning: Could not update preset from menu: {e}")
+	def RenamePreset(self, presetname, newname):
+		"""
+		Rename a preset, keeping its position in the library.
+		"""
+		if not presetname or presetname not in self.Presets:
+			print(f"Warning: Preset '{presetname}' not found")
+			return False
+		if not newname or newname in self.Presets:
+			print(f"Warning: Preset name '{newname}' is invalid or already exists")
+			return False
 
-	def OnSave(self, par):
-		"""Callback for Save button - saves preset with auto-increment naming."""
-		# Get preset name from Savename parameter if available
-		preset_name = None
-		try:
-			savename_par = self.ownerComp.par.Savename
-			if savename_par:
-				savename_val = savename_par.eval()
-				if savename_val and savename_val.strip():
-					preset_name = savename_val.strip()
-		except Exception:
-			pass
-		
-		# If Savename is empty, use None to trigger auto-increment
-		# SavePreset will handle auto-increment if preset_name already exists
-		saved_name = self.SavePreset(preset_name)
-		if saved_name:
-			# Update current preset
-			self.SetActivePreset(saved_name)
+		# Spill files are keyed by name, bring the preset back into memory first
+		if self._is_spilled(presetname):
+			self._restore_preset(presetname)
 
-	def OnSaveas(self, par):
+		presets = {(newname if name == presetname else name): data for name, data in self.Presets.items()}
+		self.Presets = presets
+		self._invalidate_preset_caches(presetname, renamed_to=newname)
+		self._invalidate_preset_caches(newname)
+		if presetname in self._preset_last_used:
+			self._preset_last_used[newname] = self._preset_last_used.pop(presetname)
+		if presetname in self.Timings:
+			timings = dict(self.Timings)
+			timings[newname] = timings.pop(presetname)
+			self.Timings = timings
+
+		# Update preset names list
+		self._remove_preset_name(presetname)
+		self._add_preset_name(newname)
+		self._record_change(('rename', presetname, newname))
+
+		if self.CurrentPresetName == presetname:
+			self.CurrentPresetName = newname
+			self.UpdateInfo()
+			self.UpdateMenu()
+
+		print(f"Preset '{presetname}' renamed to '{newname}'")
+		return True
+
+	# ---------- Parameter Masks ----------
+	def DefineMask(self, name, pars=None, pages=None):
+		"""
+		Define a named parameter subset, e.g. DefineMask('colors', 'Color* Bg*').
+		pars: parameter names or glob patterns (list or space separated string)
+		pages: parameter page names (list or space separated string) of the target
+		A parameter is in the mask if it matches pars or lies on one of pages.
+		Masks are stored with the component and resolved once per preset and target.
+		"""
+		if isinstance(pars, str):
+			pars = pars.split()
+		if isinstance(pages, str):
+			pages = pages.split()
+		masks = dict(self.Masks)
+		masks[name] = {'pars': list(pars or []), 'pages': list(pages or [])}
+		self.Masks = masks
+		self._clear_mask_caches()
+		return True
+
+	def DeleteMask(self, name):
+		"""Delete a named mask."""
+		if name not in self.Masks:
+			print(f"Warning: Mask '{name}' not found")
+			return False
+		masks = dict(self.Masks)
+		del masks[name]
+		self.Masks = masks
+		self._clear_mask_caches()
+		return True
+
+	def GetMaskNames(self, mask, target_op=None):
+		"""Return the sorted parameter names of target_op (default Targetop) covered by mask."""
+		target_op = target_op or self._get_target_op()
+		if target_op is None:
+			return []
+		return sorted(self._mask_target_names(mask, target_op))
+
+	def _clear_mask_caches(self):
+		"""Drop all resolved masks after a mask definition changed."""
+		self._mask_target_cache = {}
+		self._mask_preset_cache = {}
+
+	def _mask_spec(self, mask):
+		"""Return (patterns, pages) of a mask name or an inline mask."""
+		if isinstance(mask, str) and mask in self.Masks:
+			spec = self.Masks[mask]
+			return list(spec.get('pars', [])), list(spec.get('pages', []))
+		if isinstance(mask, dict):
+			pars = mask.get('pars') or []
+			pages = mask.get('pages') or []
+			return (pars.split() if isinstance(pars, str) else list(pars),
+				pages.split() if isinstance(pages, str) else list(pages))
+		if isinstance(mask, str):
+			return mask.split(), []
+		return list(mask), []
+
+	def _mask_key(self, mask):
+		"""Return a hashable cache key for a mask name or an inline mask."""
+		if isinstance(mask, str) and mask in self.Masks:
+			return ('mask', mask)
+		patterns, pages = self._mask_spec(mask)
+		return ('inline', tuple(patterns), tuple(pages))
+
+	def _mask_target_names(self, mask, target_op):
+		"""Return the set of target_op parameter names covered by mask (cached per target)."""
+		import fnmatch
+
+		key = (self._mask_key(mask), target_op.path)
+		names = self._mask_target_cache.get(key)
+		if names is not None:
+			return names
+
+		patterns, pages = self._mask_spec(mask)
+		names = set()
+		for pattern in patterns:
+			if any(c in pattern for c in '*?['):
+				names.update(par.name for par in target_op.pars(pattern))
+			else:
+				names.add(pattern)
+		if pages:
+			for page in list(target_op.customPages) + list(getattr(target_op, 'pages', [])):
+				if any(fnmatch.fnmatchcase(page.name, p) for p in pages):
+					names.update(par.name for par in page.pars)
+
+		names = frozenset(names)
+		self._mask_target_cache[key] = names
+		return names
+
+	def _resolve_mask(self, mask, presetname, target_op):
+		"""
+		Return (names, groups) of a preset limited to mask, in preset order.
+		Resolved once per preset, mask and target; cached until the preset changes.
+		"""
+		self._check_library()
+		preset_cache = self._mask_preset_cache.setdefault(presetname, {})
+		key = (self._mask_key(mask), target_op.path)
+		resolved = preset_cache.get(key)
+		if resolved is None:
+			allowed = self._mask_target_names(mask, target_op)
+			names = tuple(par_name for par_name in self._read_preset_data(presetname) if par_name in allowed)
+			groups = [(group_name, component_names)
+				for group_name, component_names in self._detect_par_groups(presetname, target_op)
+				if all(name in allowed for name in component_names)]
+			resolved = (names, groups)
+			preset_cache[key] = resolved
+		return resolved
+
+	# ---------- Transition Timing ----------
+	def SetPresetTiming(self, presetname, pars, delay=0.0, duration=None, easing=None):
+		"""
+		Set when parameters move while lerping to a preset, so a transition can stagger.
+		pars: parameter or group names (e.g. 't' for tx ty tz) or glob patterns
+			(list or space separated string)
+		delay: seconds after the lerp starts before the parameters move
+		duration: seconds the parameters take (None runs until the lerp ends)
+		easing: easing method name (None uses the lerp's easing)
+		Timings are stored with the component per preset; later calls override
+		earlier ones for parameters matched by both. The transition lasts as long
+		as the lerp time or the latest delay + duration, whichever is longer.
+		"""
+		if not presetname or presetname not in self.Presets:
+			print(f"Warning: Preset '{presetname}' not found")
+			return False
+		if isinstance(pars, str):
+			pars = pars.split()
+
+		timing = {'delay': max(float(delay), 0.0)}
+		if duration is not None:
+			timing['duration'] = max(float(duration), 0.0)
+		if easing:
+			timing['easing'] = easing
+
+		timings = dict(self.Timings)
+		preset_timings = dict(timings.get(presetname, {}))
+		for pattern in pars:
+			# Re-insert so the newest timing is matched last and wins
+			preset_timings.pop(pattern, None)
+			preset_timings[pattern] = dict(timing)
+		timings[presetname] = preset_timings
+		self.Timings = timings
+		return True
+
+	def ClearPresetTiming(self, presetname, pars=None):
+		"""Remove the timing of pars from a preset (all of its timings if pars is None)."""
+		if presetname not in self.Timings:
+			return False
+		timings = dict(self.Timings)
+		if pars is None:
+			del timings[presetname]
+		else:
+			if isinstance(pars, str):
+				pars = pars.split()
+			preset_timings = {pattern: timing for pattern, timing in timings[presetname].items()
+				if pattern not in pars}
+			if preset_timings:
+				timings[presetname] = preset_timings
+			else:
+				del timings[presetname]
+		self.Timings = timings
+		return True
+
+	def GetPresetTiming(self, presetname):
+		"""Return a preset's timings: {pattern: {'delay', 'duration', 'easing'}}."""
+		return {pattern: dict(timing) for pattern, timing in self.Timings.get(presetname, {}).items()}
+
+	def _compile_lerp_timing(self, presetname, lerptime):
+		"""
+		Compile a preset's timings into per-slot arrays of the packed main lerp,
+		so each frame stays one vectorized pass over all slots.
+		Returns None if no timing matches a lerped parameter, else dict:
+			'duration' (total seconds), 'scale'/'offset' (local progress of a slot
+			is t_raw * scale - offset), 'groups' [(easing method or None, slot
+			indices or None for all slots), ...], 'grid' and a 'local' work buffer
+		"""
+		import fnmatch
+
+		preset_timings = self.Timings.get(presetname)
+		if not preset_timings or not self._lerp_writes:
+			return None
+
+		# Last matching timing per write
+		write_timings = []
+		matched = False
+		for par_name, par, offset, width, kind in self._lerp_writes:
+			timing = None
+			for pattern, spec in preset_timings.items():
+				if fnmatch.fnmatchcase(par_name, pattern):
+					timing = spec
+			write_timings.append(timing)
+			matched = matched or timing is not None
+		if not matched:
+			return None
+
+		total = float(lerptime)
+		for timing in write_timings:
+			if timing is not None:
+				total = max(total, timing['delay'] + timing.get('duration', 0.0))
+
+		slot_count = self._lerp_start.size
+		delays = np.zeros(slot_count, dtype=np.float64)
+		durations = np.full(slot_count, float(lerptime), dtype=np.float64)
+		easing_slots = {}
+		for (par_name, par, offset, width, kind), timing in zip(self._lerp_writes, write_timings):
+			easing_method = None
+			if timing is not None:
+				delay = timing['delay']
+				delays[offset:offset + width] = delay
+				durations[offset:offset + width] = timing.get('duration', total - delay)
+				easing_method = timing.get('easing')
+			easing_slots.setdefault(easing_method, []).extend(range(offset, offset + width))
+
+		# Zero durations jump at their delay
+		durations = np.maximum(durations, 1e-9)
+		if len(easing_slots) == 1:
+			groups = [(easing_method, None) for easing_method in easing_slots]
+		else:
+			groups = [(easing_method, np.array(slots, dtype=np.intp))
+				for easing_method, slots in easing_slots.items()]
+		return {
+			'duration': total,
+			'scale': total / durations,
+			'offset': delays / durations,
+			'groups': groups,
+			'grid': np.linspace(0.0, 1.0, EASING_LUT_SIZE + 1),
+			'local': np.empty(slot_count, dtype=np.float64),
+		}
+
+	# ---------- Validation ----------
+	def ValidatePreset(self, presetname, target_op=None):
+		"""
+		Classify every stored parameter of a preset against target_op (default
+		Targetop). Cached per preset and target parameter set.
+		Returns dict: 'present', 'missing', 'type_mismatch' [par_name, ...] and
+			'renamed' {stored name: likely current name}, or None if not found.
+		"""
+		if not presetname or presetname not in self.Presets:
+			print(f"Warning: Preset '{presetname}' not found")
+			return None
+		target_op = target_op or self._get_target_op()
+		if target_op is None:
+			return None
+		result = self._validate_preset(presetname, target_op)
+		return {
+			'present': list(result['present']),
+			'missing': list(result['missing']),
+			'renamed': dict(result['renamed']),
+			'type_mismatch': list(result['type_mismatch']),
+		}
+
+	def _target_signature(self, target_op):
+		"""
+		Return a signature of target_op's parameter set. Built-in parameters are
+		fixed per OP type, so only the type and the custom parameter names are
+		hashed. Computed at most once per frame and target.
+		"""
+		cached = self._target_signatures.get(target_op.path)
+		if cached is not None and cached[0] == absTime.frame:
+			return cached[1]
+		signature = hash((getattr(target_op, 'OPType', None),
+			tuple(par.name for par in target_op.customPars)))
+		self._target_signatures[target_op.path] = (absTime.frame, signature)
+		return signature
+
+	def _validate_preset(self, presetname, target_op):
+		"""
+		Validate a preset against target_op's parameter set, cached per
+		(preset, parameter set signature) until the preset changes.
+		Returns dict with 'present', 'missing', 'type_mismatch', 'renamed'
+		and 'skip' (set of names to skip when applying: missing and renamed).
+		"""
+		self._check_library()
+		signature = self._target_signature(target_op)
+		preset_cache = self._validation_cache.setdefault(presetname, {})
+		result = preset_cache.get(signature)
+		if result is not None:
+			return result
+
+		import difflib
+
+		target_names = [par.name for par in target_op.pars()]
+		preset_data = self._read_preset_data(presetname)
+		target_set = set(target_names)
+		present = []
+		missing = []
+		type_mismatch = []
+		for par_name, par_value in preset_data.items():
+			if par_name not in target_set:
+				missing.append(par_name)
+				continue
+			par = self._resolve_par(target_op, par_name)
+			try:
+				self._convert_par_value(par, par_value)
+				present.append(par_name)
+			except (ValueError, TypeError):
+				type_mismatch.append(par_name)
+
+		# Rename candidates: current parameters the preset does not store yet
+		renamed = {}
+		if missing:
+			unused = [name for name in target_names if name not in preset_data]
+			unused_lower = {name.lower(): name for name in unused}
+			for par_name in missing:
+				candidate = unused_lower.get(par_name.lower())
+				if candidate is None:
+					matches = difflib.get_close_matches(par_name, unused, n=1, cutoff=0.8)
+					candidate = matches[0] if matches else None
+				if candidate is not None and candidate not in renamed.values():
+					renamed[par_name] = candidate
+			missing = [par_name for par_name in missing if par_name not in renamed]
+
+		result = {
+			'present': present,
+			'missing': missing,
+			'renamed': renamed,
+			'type_mismatch': type_mismatch,
+			'skip': frozenset(missing) | frozenset(renamed),
+		}
+		preset_cache[signature] = result
+		return result
+
+	def MigratePresets(self, presetnames=None, renames=None, drop_missing=False, target_op=None):
+		"""
+		Update stored presets to target_op's (default Targetop) current parameter set.
+		presetnames: presets to migrate (None = all)
+		renames: explicit {old name: new name}; None uses the detected rename candidates
+		drop_missing: also remove parameters that no longer exist
+		Returns {presetname: {'renamed': {old: new}, 'dropped': [par_name, ...]}}
+			for every preset that changed.
+		"""
+		target_op = target_op or self._get_target_op()
+		if target_op is None:
+			return {}
+		if presetnames is None:
+			presetnames = list(self.Presets.keys())
+
+		report = {}
+		presets = dict(self.Presets)
+		for presetname in presetnames:
+			if presetname not in presets:
+				continue
+			result = self._validate_preset(presetname, target_op)
+			preset_renames = renames if renames is not None else result['renamed']
+			preset_data = self._read_preset_data(presetname)
+
+			renamed = {old: new for old, new in preset_renames.items()
+				if old in preset_data and new not in preset_data}
+			dropped = [par_name for par_name in result['missing'] if par_name not in renamed] if drop_missing else []
+			if not renamed and not dropped:
+				continue
+
+			# Keep the stored parameter order
+			migrated = {}
+			for par_name, par_value in preset_data.items():
+				if par_name in dropped:
+					continue
+				migrated[renamed.get(par_name, par_name)] = par_value
+			presets[presetname] = self._encode_preset(presetname, migrated)
+			report[presetname] = {'renamed': renamed, 'dropped': dropped}
+
+		if report:
+			self.Presets = presets
+			for presetname in report:
+				self._invalidate_preset_caches(presetname)
+				self._record_change(('save', presetname, self._read_preset_data(presetname)))
+		print(f"Migrated {len(report)} presets")
+		return report
+
+	# ---------- Shared Library ----------
+	@property
+	def Presets(self):
+		"""The preset library: {presetname: {par_name: value}} (of the shared library owner, if set)."""
+		self._check_library()
+		return self._get_library().stored['Presets']
+
+	def _check_library(self):
+		"""Drop caches made stale by other instances sharing the library (before using a cache)."""
+		library = self._get_library()
+		if library._library_version != self._library_seen:
+			self._catch_up_library(library)
+
+	@Presets.setter
+	def Presets(self, value):
+		self._get_library().stored['Presets'] = value
+
+	@property
+	def PresetNames(self):
+		"""Sorted preset names of the library."""
+		return self._get_library().stored['PresetNames']
+
+	@PresetNames.setter
+	def PresetNames(self, value):
+		self._get_library().stored['PresetNames'] = value
+
+	def SetLibrary(self, library):
+		"""
+		Use the preset library of another Presetter instead of this one's.
+		library: Presetter COMP, its path, a key registered with ShareLibrary(),
+			or None to use this Presetter's own library again.
+		Presets are stored once in the owner; saves from any instance are
+		visible to all. The current preset stays per instance. Overrides the
+		optional Library parameter.
+		"""
+		self._library_ref = library if library is not None else ''
+		self._library_frame = None
+		library_ext = self._get_library()
+		if library is not None and library_ext is self:
+			print(f"Warning: Presetter library '{library}' could not be used, using own library")
+		# Everything cached was derived from the previous library
+		self._drop_preset_caches()
+		self._library_seen = library_ext._library_version
+		if self.CurrentPresetName is not None and self.CurrentPresetName not in self.Presets:
+			self.CurrentPresetName = None
+		self.UpdateInfo()
+		self.UpdateMenu()
+		return library_ext is not self
+
+	def ShareLibrary(self, key):
+		"""Register this Presetter's library under key, so instances can SetLibrary(key)."""
+		try:
+			libraries = dict(root.fetch('PresetterLibraries', {}, storeDefault=False))
+			libraries[key] = self.ownerComp.path
+			root.store('PresetterLibraries', libraries)
+		except Exception as e:
+			print(f"Warning: Could not register library '{key}': {e}")
+			return False
+		return True
+
+	def _get_library(self):
+		"""Return the extension owning the preset library (self unless shared). Resolved once per frame."""
+		if not self._library_ready:
+			return self
+		if self._library_frame == absTime.frame and self._library_ext is not None:
+			return self._library_ext
+		self._library_frame = absTime.frame
+		self._library_ext = self._resolve_library()
+		if self._library_ext is not self:
+			self._library_ext._library_users.add(self)
+		return self._library_ext
+
+	def _resolve_library(self):
+		"""Follow library references to the owning extension (self if not shared or on a cycle)."""
+		library = self
+		seen = {self.ownerComp.path}
+		while True:
+			referenced = library._library_target()
+			if referenced is None:
+				return library
+			if referenced.ownerComp.path in seen:
+				print("Warning: Presetter libraries reference each other, using own library")
+				return self
+			seen.add(referenced.ownerComp.path)
+			library = referenced
+
+	def _library_target(self):
+		"""Return the extension directly referenced as library (SetLibrary, else Library parameter), or None."""
+		ref = self._library_ref
+		if ref is None:
+			try:
+				ref = self.ownerComp.par.Library.eval()
+			except Exception:
+				ref = None
+		if not ref:
+			return None
+
+		comp = ref
+		if isinstance(ref, str):
+			try:
+				path = root.fetch('PresetterLibraries', {}, storeDefault=False).get(ref, ref)
+			except Exception:
+				path = ref
+			comp = op(path)
+		library = getattr(getattr(comp, 'ext', None), 'presetterext', None) if comp is not None else None
+		if library is None or library is self or not library._library_ready:
+			return None
+		return library
+
+	def _notify_library_change(self, presetname, renamed_to=None):
+		"""
+		Log a library change and let the other instances sharing the library
+		catch up (drop derived caches, follow or clear their current preset).
+		"""
+		library = self._get_library()
+		up_to_date = self._library_seen == library._library_version
+		library._library_version += 1
+		library._library_changes.append((presetname, renamed_to))
+		if len(library._library_changes) > LIBRARY_LOG_SIZE:
+			del library._library_changes[0]
+		if up_to_date:
+			# This instance already dropped its caches for the change
+			self._library_seen = library._library_version
+
+		for user in [library] + list(library._library_users):
+			if user is not self and user._get_library() is library:
+				user._check_library()
+
+	def _catch_up_library(self, library):
+		"""Drop the derived caches of presets changed through other instances since the last access."""
+		missed = library._library_version - self._library_seen
+		self._library_seen = library._library_version
+		current = self.CurrentPresetName
+		if missed < 0 or missed > len(library._library_changes):
+			self._drop_preset_caches()
+		else:
+			for presetname, renamed_to in library._library_changes[len(library._library_changes) - missed:]:
+				self._drop_preset_caches(presetname)
+				if renamed_to is not None and presetname == current:
+					current = renamed_to
+
+		# The current preset stays per instance; follow renames, clear it when deleted
+		if current is not None and current not in library.stored['Presets']:
+			current = None
+		if current != self.CurrentPresetName:
+			self.CurrentPresetName = current
+		self.UpdateInfo()
+		self.UpdateMenu()
+
+	# ---------- Memory Budget ----------
+	def _is_spilled(self, presetname):
+		"""Return True if the preset was moved out to the disk cache."""
+		preset_data = self.Presets.get(presetname)
+		return preset_data is not None and SPILLED_KEY in preset_data
+
+	def _touch_preset(self, presetname):
+		"""Mark a preset as most recently used."""
+		self._preset_use_counter += 1
+		self._preset_last_used[presetname] = self._preset_use_counter
+
+	def _preset_data(self, presetname):
+		"""
+		Return a preset's stored dict for applying it. Spilled presets are
+		restored from the disk cache first. Marks the preset as recently used.
+		"""
+		self._touch_preset(presetname)
+		if self._is_spilled(presetname):
+			self._restore_preset(presetname)
+		return self._decode_preset(presetname, self.Presets[presetname])
+
+	def _read_preset_data(self, presetname):
+		"""Return a preset's stored dict without restoring it (spilled presets are read from disk)."""
+		preset_data = self.Presets[presetname]
+		if SPILLED_KEY in preset_data:
+			return self._decode_preset(None, self._read_spill_file(preset_data[SPILLED_KEY]['file']))
+		return self._decode_preset(presetname, preset_data)
+
+	def _stored_par_count(self, preset_data):
+		"""Return the parameter count of a stored preset (plain or compressed)."""
+		if COMPRESSED_KEY in preset_data:
+			return preset_data[COMPRESSED_KEY][1]
+		return len(preset_data)
+
+	def _estimate_size(self, value):
+		"""Estimate the memory used by a stored value in bytes (containers included)."""
+		import sys
+
+		size = sys.getsizeof(value)
+		if value is None or isinstance(value, (str, bytes, bool, int, float)):
+			return size
+		if hasattr(value, 'items'):
+			# Dicts and dependable dicts
+			for key, item in value.items():
+				size += self._estimate_size(key) + self._estimate_size(item)
+		elif hasattr(value, '__iter__'):
+			# Lists, tuples and dependable lists
+			for item in value:
+				size += self._estimate_size(item)
+		return size
+
+	def _plain_value(self, value):
+		"""
+		Deep-convert a stored value to plain dict/list/tuple containers, so its
+		repr() reads back with ast.literal_eval independent of the container
+		types StorageManager uses for dependable storage.
+		"""
+		if value is None or isinstance(value, (str, bytes, bool, int, float)):
+			return value
+		if isinstance(value, tuple):
+			return tuple(self._plain_value(item) for item in value)
+		if hasattr(value, 'items'):
+			return {self._plain_value(key): self._plain_value(item) for key, item in value.items()}
+		if hasattr(value, '__iter__'):
+			# Lists and dependable lists
+			return [self._plain_value(item) for item in value]
+		return value
+
+	def _preset_size(self, presetname):
+		"""Return the cached estimated in-memory size of a preset (0 while spilled)."""
+		self._check_library()
+		size = self._preset_sizes.get(presetname)
+		if size is None:
+			size = 0 if self._is_spilled(presetname) else self._estimate_size(self.Presets[presetname])
+			self._preset_sizes[presetname] = size
+		return size
+
+	def GetMemoryReport(self, top=None):
+		"""
+		Report the estimated memory used by the stored presets.
+		top: only list the top N largest presets (None = all)
+		Returns dict:
+			'total_bytes': estimated in-memory size of all presets,
+			'presets': [{'name', 'bytes', 'pars', 'spilled'}, ...] largest first,
+			'duplicate_ratio': share of (parameter, value) pairs that repeat
+				another in-memory preset's pair,
+			'spilled_count', 'budget_bytes'
+		"""
+		import collections
+
+		presets = []
+		pair_counts = collections.Counter()
+		for presetname, preset_data in self.Presets.items():
+			spilled = SPILLED_KEY in preset_data
+			if spilled:
+				par_count = preset_data[SPILLED_KEY]['pars']
+			else:
+				par_count = self._stored_par_count(preset_data)
+				pair_counts.update((par_name, repr(value)) for par_name, value in self._decode_preset(None, preset_data).items())
+			presets.append({
+				'name': presetname,
+				'bytes': self._preset_size(presetname),
+				'pars': par_count,
+				'spilled': spilled,
+			})
+
+		presets.sort(key=lambda item: item['bytes'], reverse=True)
+		total_pairs = sum(pair_counts.values())
+		duplicate_ratio = 1.0 - len(pair_counts) / total_pairs if total_pairs else 0.0
+		return {
+			'total_bytes': sum(item['bytes'] for item in presets),
+			'presets': presets[:top] if top is not None else presets,
+			'duplicate_ratio': duplicate_ratio,
+			'spilled_count': sum(1 for item in presets if item['spilled']),
+			'budget_bytes': self._get_memory_budget(),
+		}
+
+	def SetMemoryBudget(self, max_bytes):
+		"""
+		Set the memory budget for stored presets in bytes (None disables it).
+		While the estimated total exceeds the budget, the least recently used
+		presets are moved to a disk cache. They stay listed in PresetNames and
+		are restored transparently when used. Overrides the Memorybudget
+		parameter (MB) if it exists.
+		Spilled presets are NOT part of the stored Presets item: a .toe/.tox
+		saved while presets are spilled only holds stubs pointing to the cache
+		files and loses those presets when moved without the cache folder.
+		Call RestoreSpilledPresets (e.g. from an Execute DAT's onProjectPreSave)
+		before saving. Disabling the budget restores every spilled preset.
+		"""
+		self._memory_budget = int(max_bytes) if max_bytes else None
+		if self._get_memory_budget() is None:
+			self.RestoreSpilledPresets()
+			return []
+		return self._enforce_memory_budget()
+
+	def RestoreSpilledPresets(self):
+		"""
+		Move every spilled preset back into the stored Presets item, ignoring
+		the memory budget, so saving the COMP saves all presets.
+		Returns the number of presets that could not be restored.
+		"""
+		presets = dict(self.Presets)
+		restored = []
+		failed = 0
+		for presetname, preset_data in presets.items():
+			if SPILLED_KEY not in preset_data:
+				continue
+			path = preset_data[SPILLED_KEY]['file']
+			try:
+				presets[presetname] = self._read_spill_file(path)
+			except Exception as e:
+				print(f"Warning: Could not restore preset '{presetname}' from the disk cache: {e}")
+				failed += 1
+				continue
+			restored.append((presetname, path))
+
+		if restored:
+			self.Presets = presets
+			for presetname, path in restored:
+				self._preset_sizes.pop(presetname, None)
+				try:
+					os.remove(path)
+				except OSError:
+					pass
+			print(f"Memory budget: restored {len(restored)} presets from the disk cache")
+		return failed
+
+	def _get_memory_budget(self):
+		"""Return the memory budget in bytes, or None when unlimited."""
+		if self._memory_budget is not None:
+			return self._memory_budget
+		try:
+			budget_mb = self.ownerComp.par.Memorybudget.eval()
+			if budget_mb and budget_mb > 0:
+				return int(budget_mb * 1024 * 1024)
+		except Exception:
+			pass
+		return None
+
+	def _enforce_memory_budget(self, keep=None):
+		"""
+		Spill least recently used presets until the total is within budget.
+		keep: a preset that must stay in memory (e.g. the one being restored).
+		Returns the spilled names.
+		"""
+		budget = self._get_memory_budget()
+		if budget is None:
+			return []
+
+		total = sum(self._preset_size(presetname) for presetname in self.Presets.keys())
+		if total <= budget:
+			return []
+
+		# Oldest first; presets never used in this session count as oldest
+		candidates = sorted(
+			(presetname for presetname in self.Presets.keys() if not self._is_spilled(presetname)),
+			key=lambda presetname: self._preset_last_used.get(presetname, 0))
+		# Never spill the preset in use right now
+		for presetname in (self.CurrentPresetName, keep):
+			if presetname in candidates:
+				candidates.remove(presetname)
+
+		spilled = []
+		presets = dict(self.Presets)
+		for presetname in candidates:
+			if total <= budget:
+				break
+			size = self._preset_size(presetname)
+			stub = self._spill_preset(presetname, presets[presetname])
+			if stub is None:
+				break
+			presets[presetname] = stub
+			self._preset_sizes[presetname] = 0
+			total -= size
+			spilled.append(presetname)
+
+		if spilled:
+			self.Presets = presets
+			print(f"Memory budget: moved {len(spilled)} presets to the disk cache")
+		return spilled
+
+	def _get_spill_folder(self):
+		"""Return the disk cache folder of this Presetter (Cachefolder parameter, else Data/PresetCache/<path>)."""
+		try:
+			folder = self.ownerComp.par.Cachefolder.eval()
+			if folder:
+				return folder
+		except Exception:
+			pass
+		return os.path.join('Data', 'PresetCache', self.ownerComp.path.strip('/').replace('/', '.'))
+
+	def _get_spill_file(self, presetname):
+		"""Return the cache file path for a preset (hashed, so any preset name is a valid file name)."""
+		import hashlib
+
+		digest = hashlib.md5(presetname.encode('utf-8')).hexdigest()
+		return os.path.join(self._get_spill_folder(), f'{digest}.preset')
+
+	def _spill_preset(self, presetname, preset_data):
+		"""Write a preset to the disk cache. Returns its stub, or None if writing failed."""
+		path = self._get_spill_file(presetname)
+		try:
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			with open(path, 'w', encoding='utf-8') as f:
+				f.write(repr(self._plain_value(preset_data)))
+		except Exception as e:
+			print(f"Warning: Could not write preset '{presetname}' to the disk cache: {e}")
+			return None
+		return {SPILLED_KEY: {'file': path, 'pars': self._stored_par_count(preset_data)}}
+
+	def _read_spill_file(self, path):
+		"""Read a preset dict from a disk cache file."""
+		import ast
+
+		with open(path, 'r', encoding='utf-8') as f:
+			return ast.literal_eval(f.read())
+
+	def _restore_preset(self, presetname):
+		"""Move a spilled preset back into memory, spilling others if the budget requires it."""
+		stub = self.Presets[presetname][SPILLED_KEY]
+		try:
+			preset_data = self._read_spill_file(stub['file'])
+		except Exception as e:
+			print(f"Warning: Could not restore preset '{presetname}' from the disk cache: {e}")
+			return False
+		presets = dict(self.Presets)
+		presets[presetname] = preset_data
+		self.Presets = presets
+		self._preset_sizes.pop(presetname, None)
+		try:
+			os.remove(stub['file'])
+		except OSError:
+			pass
+		self._enforce_memory_budget(keep=presetname)
+		return True
+
+	def _remove_spill_files(self, presetname=None):
+		"""Delete a preset's disk cache file, or every cache file of this Presetter if presetname is None."""
+		if presetname is not None:
+			paths = [self._get_spill_file(presetname)]
+		else:
+			folder = self._get_spill_folder()
+			try:
+				paths = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.preset')]
+			except OSError:
+				return
+		for path in paths:
+			try:
+				if os.path.exists(path):
+					os.remove(path)
+			except OSError:
+				pass
+
+	# ---------- Compression ----------
+	def SetCompression(self, enabled):
+		"""
+		Store preset payloads zlib-compressed (pickled, then compressed) to keep
+		the stored library and the .toe/.tox small. Loading stays transparent;
+		decompressed presets are cached, so hot presets are only decoded once.
+		Re-encodes all in-memory presets. Overrides the Compress parameter.
+		"""
+		self._compression = bool(enabled)
+		presets = {}
+		for presetname, preset_data in self.Presets.items():
+			if SPILLED_KEY in preset_data:
+				# Restored in its stored form, decoding handles both forms
+				presets[presetname] = preset_data
+				continue
+			pars_dict = self._decode_preset(presetname, preset_data)
+			presets[presetname] = self._encode_preset(presetname, pars_dict)
+		self.Presets = presets
+		self._preset_sizes = {}
+		self._decoded_presets = {}
+		print(f"Preset compression {'enabled' if self._compression else 'disabled'}")
+		return True
+
+	def _get_compression(self):
+		"""Return True if new presets are stored compressed."""
+		if self._compression is not None:
+			return self._compression
+		try:
+			return bool(self.ownerComp.par.Compress.eval())
+		except Exception:
+			return False
+
+	def _encode_preset(self, presetname, pars_dict):
+		"""Return the form a preset dict is stored in (compressed stub or the dict itself)."""
+		import pickle
+		import zlib
+
+		if not self._get_compression():
+			return pars_dict
+		payload = zlib.compress(pickle.dumps(pars_dict, protocol=4))
+		return {COMPRESSED_KEY: (payload, len(pars_dict))}
+
+	def _decode_preset(self, presetname, preset_data):
+		"""
+		Return the preset dict of a stored preset. Compressed presets are
+		decompressed once and cached per name until their payload changes
+		(up to DECODE_CACHE_SIZE presets). presetname None decodes without caching.
+		"""
+		import pickle
+		import zlib
+
+		if COMPRESSED_KEY not in preset_data:
+			return preset_data
+		payload = preset_data[COMPRESSED_KEY][0]
+		# Entries are keyed by payload identity, so stale ones never match
+		cached = self._decoded_presets.pop(presetname, None)
+		if cached is not None and cached[0] is payload:
+			# Re-insert to mark as most recently used
+			self._decoded_presets[presetname] = cached
+			return cached[1]
+		pars_dict = pickle.loads(zlib.decompress(payload))
+		if presetname is not None:
+			self._cache_decoded_preset(presetname, preset_data, pars_dict)
+		return pars_dict
+
+	def _cache_decoded_preset(self, presetname, preset_data, pars_dict):
+		"""Cache the decoded dict of a compressed preset, dropping the least recently used."""
+		if COMPRESSED_KEY not in preset_data:
+			return
+		self._decoded_presets[presetname] = (preset_data[COMPRESSED_KEY][0], pars_dict)
+		while len(self._decoded_presets) > DECODE_CACHE_SIZE:
+			del self._decoded_presets[next(iter(self._decoded_presets))]
+
+	def BenchmarkCompression(self, presetname=None, repeat=20):
+		"""
+		Compare storage size and load latency with and without compression.
+		presetname: preset used for the load timings (None = current preset)
+		repeat: number of timed loads per variant
+		Returns dict:
+			'raw_bytes'/'compressed_bytes'/'ratio': pickled size of the whole library,
+			'decode_ms': cold decompression of the preset,
+			'load_plain_ms'/'load_compressed_ms'/'load_cold_ms': average LoadPreset
+				time with the preset stored plain, compressed (cached) and compressed
+				with the decode cache cleared before every load
+		The variants are swapped in temporarily without touching disk cache
+		files or notifying instances sharing the library. The target values,
+		CurrentPresetName and Has_changed are restored afterwards.
+		"""
+		import contextlib
+		import io
+		import pickle
+		import zlib
+
+		presetname = presetname or self.CurrentPresetName
+		if not presetname or presetname not in self.Presets:
+			print("Warning: No preset to benchmark")
+			return None
+
+		library = {}
+		for name in self.Presets.keys():
+			try:
+				library[name] = self._read_preset_data(name)
+			except Exception as e:
+				print(f"Warning: Skipping preset '{name}' in the compression benchmark: {e}")
+		if presetname not in library:
+			return None
+		raw_bytes = 0
+		compressed_bytes = 0
+		for pars_dict in library.values():
+			pickled = pickle.dumps(pars_dict, protocol=4)
+			raw_bytes += len(pickled)
+			compressed_bytes += len(zlib.compress(pickled))
+
+		pars_dict = library[presetname]
+		payload = zlib.compress(pickle.dumps(pars_dict, protocol=4))
+		decode_start = time.perf_counter()
+		pickle.loads(zlib.decompress(payload))
+		decode_ms = (time.perf_counter() - decode_start) * 1000.0
+
+		# Live values overwritten by the timed loads
+		saved_values = []
+		for target_op in self._get_target_ops():
+			for par_name in pars_dict:
+				par = self._resolve_par(target_op, par_name)
+				if par is not None:
+					saved_values.append((par, par.val))
+		saved_state = (self.CurrentPresetName, self.Has_changed, self._ui_reset_wait,
+			self._preset_last_used.get(presetname))
+
+		original = self.Presets[presetname]
+		variants = {
+			'load_plain_ms': (pars_dict, False),
+			'load_compressed_ms': ({COMPRESSED_KEY: (payload, len(pars_dict))}, False),
+			'load_cold_ms': ({COMPRESSED_KEY: (payload, len(pars_dict))}, True),
+		}
+		timings = {}
+		try:
+			for key, (stored, cold) in variants.items():
+				presets = dict(self.Presets)
+				presets[presetname] = stored
+				self.Presets = presets
+				# Local caches only: spill files and sharing instances stay untouched
+				self._drop_preset_caches(presetname)
+				total = 0.0
+				with contextlib.redirect_stdout(io.StringIO()):
+					for _ in range(max(int(repeat), 1)):
+						if cold:
+							self._decoded_presets.pop(presetname, None)
+						load_start = time.perf_counter()
+						self.LoadPreset(presetname)
+						total += time.perf_counter() - load_start
+				timings[key] = total * 1000.0 / max(int(repeat), 1)
+		finally:
+			presets = dict(self.Presets)
+			presets[presetname] = original
+			self.Presets = presets
+			self._drop_preset_caches(presetname)
+			for par, value in saved_values:
+				try:
+					par.val = value
+				except Exception:
+					pass
+			self.CurrentPresetName, self.Has_changed, self._ui_reset_wait, last_used = saved_state
+			if last_used is None:
+				self._preset_last_used.pop(presetname, None)
+			else:
+				self._preset_last_used[presetname] = last_used
+			self.UpdateInfo()
+
+		result = {
+			'raw_bytes': raw_bytes,
+			'compressed_bytes': compressed_bytes,
+			'ratio': compressed_bytes / raw_bytes if raw_bytes else 1.0,
+			'decode_ms': decode_ms,
+		}
+		result.update(timings)
+		print(f"Compression: {raw_bytes} -> {compressed_bytes} bytes ({result['ratio']:.1%}), "
+			f"load {timings['load_plain_ms']:.3f} ms plain / {timings['load_compressed_ms']:.3f} ms compressed "
+			f"/ {timings['load_cold_ms']:.3f} ms cold")
+		return result
+
+	# ---------- Journal ----------
+	def EnableJournal(self, path=None):
+		"""
+		Record every save, delete and rename as one appended line in a journal
+		file, so presets captured since the last .toe save survive a crash.
+		Appending costs time proportional to the changed preset only.
+		path: journal file (None = Journalfile parameter, else
+			Data/PresetJournal/<path>.journal)
+		Compacts the journal into a snapshot of the current library.
+		"""
+		self._journal_path = path or self._default_journal_path()
+		return self.CompactJournal()
+
+	def DisableJournal(self):
+		"""Stop recording changes. The journal file is kept."""
+		self._journal_path = ''
+
+	def _default_journal_path(self):
+		"""Return the Journalfile parameter, else a per-Presetter default path."""
+		try:
+			path = self.ownerComp.par.Journalfile.eval()
+			if path:
+				return path
+		except Exception:
+			pass
+		return os.path.join('Data', 'PresetJournal', self.ownerComp.path.strip('/').replace('/', '.') + '.journal')
+
+	def _get_journal_path(self):
+		"""Return the active journal path, or None when journaling is off (Journal parameter)."""
+		if self._journal_path is not None:
+			return self._journal_path or None
+		try:
+			if self.ownerComp.par.Journal.eval():
+				return self._default_journal_path()
+		except Exception:
+			pass
+		return None
+
+	def _record_change(self, record):
+		"""Record a local library change: version it, journal it and publish it to sync peers."""
+		version = self._next_sync_version()
+		for presetname in self._record_names(record):
+			self._sync_versions[presetname] = version
+		self._append_journal(record)
+		if self._sync_thread is not None:
+			if record[0] == 'rename' and record[2] in self.Presets:
+				# Peers may not have the old preset, send the data along
+				record = record + (self._read_preset_data(record[2]),)
+			self._sync_seq += 1
+			self._send_sync({'type': 'change', 'node': self._sync_node, 'seq': self._sync_seq,
+				'record': record, 'version': version})
+
+	def _append_journal(self, record):
+		"""Append one change record: ('save', name, data), ('delete', name), ('rename', old, new) or ('clear',)."""
+		path = self._get_journal_path()
+		if path is None:
+			return
+		if path != self._journal_ready:
+			# Each session's journal starts with a snapshot, so replaying it never
+			# loses presets changed since an older journal, e.g. by a .toe save
+			self.CompactJournal()
+			return
+		try:
+			with open(path, 'a', encoding='utf-8') as f:
+				f.write(repr(self._plain_value(record)) + '\n')
+		except Exception as e:
+			print(f"Warning: Could not write to the preset journal: {e}")
+			return
+
+		self._journal_records += 1
+		if self._journal_records >= JOURNAL_COMPACT_RECORDS and not self._journal_compact_scheduled:
+			# Compaction rewrites the whole library, keep it out of the saving call
+			self._journal_compact_scheduled = True
+			run(self.CompactJournal, delayFrames=1)
+
+	def _read_journal(self, path):
+		"""
+		Read the records of a journal file. Reading stops at the first
+		unreadable line, e.g. a record cut off by a crash.
+		Returns (records, complete)
+		"""
+		import ast
+
+		records = []
+		with open(path, 'r', encoding='utf-8') as f:
+			for line_number, line in enumerate(f, 1):
+				line = line.strip()
+				if not line:
+					continue
+				try:
+					records.append(ast.literal_eval(line))
+				except (ValueError, SyntaxError):
+					print(f"Warning: Preset journal is damaged at line {line_number}, ignoring the rest")
+					return records, False
+		return records, True
+
+	def _replay_records(self, presets, records):
+		"""Apply journal records onto a presets dict in order. Returns the number of records applied."""
+		applied = 0
+		for record in records:
+			kind = record[0]
+			if kind == 'snapshot':
+				presets.clear()
+				presets.update(record[1])
+			elif kind == 'save':
+				presets[record[1]] = record[2]
+			elif kind == 'delete':
+				presets.pop(record[1], None)
+			elif kind == 'rename':
+				if record[1] in presets:
+					presets[record[2]] = presets.pop(record[1])
+			elif kind == 'clear':
+				presets.clear()
+			else:
+				continue
+			applied += 1
+		return applied
+
+	def RecoverFromJournal(self, path=None):
+		"""
+		Rebuild the library by replaying the journal, e.g. after a crash lost
+		the changes made since the last .toe save. The journal starts with a
+		snapshot, so replaying it yields the library as last recorded.
+		Returns the number of presets after recovery, or None on failure.
+		"""
+		path = path or self._get_journal_path() or self._default_journal_path()
+		try:
+			records, _complete = self._read_journal(path)
+		except OSError as e:
+			print(f"Warning: Could not read the preset journal: {e}")
+			return None
+
+		presets = {}
+		applied = self._replay_records(presets, records)
+		# Journaled presets are plain, store them compressed when compression is on
+		presets = {presetname: self._encode_preset(presetname, pars_dict) for presetname, pars_dict in presets.items()}
+		self.Presets = presets
+		self._invalidate_preset_caches()
+		self.UpdatePresetNames()
+
+		if self.CurrentPresetName not in presets:
+			self.CurrentPresetName = None
+		self.UpdateInfo()
+		self.UpdateMenu()
+
+		print(f"Recovered {len(presets)} presets from {applied} journal records")
+		return len(presets)
+
+	def CompactJournal(self):
+		"""
+		Replace the journal by a single snapshot of the current library.
+		Written to a temporary file first, so a crash never leaves a
+		partial journal behind. Returns True on success.
+		"""
+		self._journal_compact_scheduled = False
+		path = self._get_journal_path()
+		if path is None:
+			return False
+
+		temp_path = path + '.tmp'
+		try:
+			# Spilled presets are journaled with their data, not their cache stub
+			presets = {}
+			for presetname in self.Presets.keys():
+				try:
+					presets[presetname] = self._read_preset_data(presetname)
+				except Exception as e:
+					print(f"Warning: Preset '{presetname}' could not be read, not journaled: {e}")
+			os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+			with open(temp_path, 'w', encoding='utf-8') as f:
+				f.write(repr(('snapshot', self._plain_value(presets))) + '\n')
+			os.replace(temp_path, path)
+		except Exception as e:
+			print(f"Warning: Could not compact the preset journal: {e}")
+			return False
+
+		self._journal_records = 0
+		self._journal_ready = path
+		return True
+
+	# ---------- Sync ----------
+	def StartSync(self, port, peers, host='0.0.0.0'):
+		"""
+		Keep this library in sync with Presetters in other TouchDesigner
+		instances. Every save, delete and rename is sent to the peers as one
+		compact versioned change record over UDP instead of the whole library.
+		port: local UDP port to receive changes on
+		peers: [(host, port), ...] or ['host:port', ...] of the other instances
+		Conflicts resolve last-writer-wins by (Lamport clock, node id). A peer
+		that misses records (sequence gap) or just started requests a full
+		snapshot, which is merged per preset by version. Every
+		SYNC_DIGEST_SECONDS a digest of the library versions is sent as well,
+		so lost last changes or snapshot chunks are detected and resynced.
+		Messages from addresses other than peers are ignored.
+		"""
+		import collections
+		import socket
+		import threading
+		import uuid
+
+		self.StopSync()
+		sync_peers = []
+		for peer in peers:
+			if isinstance(peer, str):
+				peer_host, peer_port = peer.rsplit(':', 1)
+				peer = (peer_host, peer_port)
+			try:
+				# Received datagrams carry the numeric address, compare against that
+				sync_peers.append((socket.gethostbyname(peer[0]), int(peer[1])))
+			except (OSError, ValueError) as e:
+				print(f"Warning: Ignoring sync peer {peer}: {e}")
+
+		try:
+			sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+			sock.bind((host, port))
+			sock.settimeout(SOCKET_POLL_SECONDS)
+		except OSError as e:
+			print(f"Warning: Could not listen for sync on UDP port {port}: {e}")
+			return False
+		try:
+			# Room for a burst of snapshot chunks between two recv calls
+			sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+		except OSError:
+			pass
+
+		self._sync_node = self._sync_node or uuid.uuid4().hex[:12]
+		self._sync_peers = sync_peers
+		self._sync_peer_seqs = {}
+		self._sync_next_digest = absTime.seconds + SYNC_DIGEST_SECONDS
+		self._sync_socket = sock
+		self._sync_queue = collections.deque()
+		self._sync_thread = threading.Thread(
+			target=self._sync_loop, args=(sock, self._sync_queue, frozenset(sync_peers)),
+			name=f'Presetter sync {port}', daemon=True)
+		self._sync_thread.start()
+		self._update_execute_active()
+
+		# Catch up with the library of peers that are already running
+		self._send_sync({'type': 'resync_request', 'node': self._sync_node})
+		print(f"Sync listening on UDP port {sock.getsockname()[1]} with {len(self._sync_peers)} peers")
+		return True
+
+	def StopSync(self):
+		"""Stop syncing. Versions are kept, so a later StartSync resolves conflicts correctly."""
+		if self._sync_thread is None:
+			return
+		thread = self._sync_thread
+		sock = self._sync_socket
+		self._sync_thread = None
+		self._sync_socket = None
+		self._sync_queue = None
+		# Free the port only after the thread left its pending recv (see StopRemote)
+		thread.join(SOCKET_POLL_SECONDS * 2)
+		try:
+			sock.close()
+		except OSError:
+			pass
+		self._update_execute_active()
+
+	def RequestResync(self):
+		"""Ask all peers for a full snapshot of their library (merged by version)."""
+		if self._sync_thread is None:
+			return False
+		self._send_sync({'type': 'resync_request', 'node': self._sync_node})
+		return True
+
+	def GetSyncState(self):
+		"""Return a dict describing the sync state."""
+		return {
+			'active': self._sync_thread is not None,
+			'node': self._sync_node,
+			'port': self._sync_socket.getsockname()[1] if self._sync_socket is not None else None,
+			'peers': list(self._sync_peers),
+			'clock': self._sync_clock,
+			'seq': self._sync_seq,
+			'peer_seqs': dict(self._sync_peer_seqs),
+		}
+
+	def _next_sync_version(self):
+		"""Return a new version (Lamport clock, node id) for a local change."""
+		self._sync_clock += 1
+		return (self._sync_clock, self._sync_node or '')
+
+	def _sync_version(self, presetname):
+		"""Return the version of a preset (deleted presets keep theirs), (0, '') if unknown."""
+		return tuple(self._sync_versions.get(presetname, (0, '')))
+
+	def _content_hash(self, preset_data):
+		"""Return a hash of preset data independent of dict order and container types."""
+		import hashlib
+
+		def canonical(value):
+			if hasattr(value, 'items'):
+				return tuple(sorted(((repr(key), canonical(item)) for key, item in value.items())))
+			if isinstance(value, (list, tuple)):
+				return tuple(canonical(item) for item in value)
+			return value
+
+		state = repr(canonical(self._plain_value(preset_data)))
+		return hashlib.md5(state.encode('utf-8')).hexdigest()
+
+	def _preset_content_hash(self, presetname):
+		"""Return the cached content hash of a preset ('' if it cannot be read)."""
+		content_hash = self._content_hashes.get(presetname)
+		if content_hash is None:
+			try:
+				content_hash = self._content_hash(self._read_preset_data(presetname))
+			except Exception as e:
+				print(f"Warning: Could not hash preset '{presetname}' for sync: {e}")
+				return ''
+			self._content_hashes[presetname] = content_hash
+		return content_hash
+
+	def _record_names(self, record):
+		"""Return the preset names a change record touches."""
+		kind = record[0]
+		if kind in ('save', 'delete'):
+			return [record[1]]
+		if kind == 'rename':
+			return [record[1], record[2]]
+		if kind == 'clear':
+			return list(self.Presets.keys())
+		return []
+
+	def _send_sync(self, message, peers=None):
+		"""Send a message to peers: zlib-compressed repr, split into chunks of SYNC_CHUNK_SIZE."""
+		import struct
+		import zlib
+
+		sock = self._sync_socket
+		if sock is None:
+			return
+		payload = zlib.compress(repr(self._plain_value(message)).encode('utf-8'))
+		chunks = [payload[i:i + SYNC_CHUNK_SIZE] for i in range(0, len(payload), SYNC_CHUNK_SIZE)] or [b'']
+		if len(chunks) > 0xFFFF:
+			print("Warning: Sync message too large, not sent")
+			return
+		self._sync_message_id = (self._sync_message_id + 1) & 0xFFFFFFFF
+		for peer in (peers if peers is not None else self._sync_peers):
+			for index, chunk in enumerate(chunks):
+				header = b'PSYN' + struct.pack('>IHH', self._sync_message_id, index, len(chunks))
+				try:
+					sock.sendto(header + chunk, peer)
+				except OSError as e:
+					print(f"Warning: Could not send sync message to {peer[0]}:{peer[1]}: {e}")
+					break
+
+	def _sync_loop(self, sock, queue, peers):
+		"""
+		Sync thread: receive chunks from peers, reassemble and decode messages,
+		queue them for the main thread. Datagrams from other addresses are dropped.
+		"""
+		import ast
+		import struct
+		import zlib
+
+		partial = {}
+		while self._sync_socket is sock:
+			try:
+				data, address = sock.recvfrom(65536)
+			except OSError:
+				continue
+			if address not in peers or not data.startswith(b'PSYN') or len(data) < 12:
+				continue
+			message_id, index, count = struct.unpack_from('>IHH', data, 4)
+			key = (address, message_id)
+			chunks = partial.setdefault(key, {})
+			chunks[index] = data[12:]
+			if len(chunks) < count:
+				if len(partial) > 64:
+					# Drop the oldest incomplete message, the next digest detects it
+					del partial[next(iter(partial))]
+				continue
+			del partial[key]
+			try:
+				payload = b''.join(chunks[i] for i in range(count))
+				message = ast.literal_eval(zlib.decompress(payload).decode('utf-8'))
+			except Exception:
+				continue
+			queue.append((address, message))
+
+	def _update_sync(self):
+		"""Per-frame sync work: apply queued messages and send the periodic library digest."""
+		if self._sync_queue:
+			self._drain_sync_messages()
+		if self._sync_thread is not None and absTime.seconds >= self._sync_next_digest:
+			self._sync_next_digest = absTime.seconds + SYNC_DIGEST_SECONDS
+			self._send_sync({'type': 'digest', 'node': self._sync_node, 'seq': self._sync_seq,
+				'digest': self._sync_digest()})
+
+	def _sync_digest(self):
+		"""Return a digest of the preset versions and contents, equal on peers with the same library state."""
+		import hashlib
+
+		versions = sorted((presetname, tuple(version)) for presetname, version in self._sync_versions.items()
+			if tuple(version) != (0, ''))
+		contents = sorted((presetname, self._preset_content_hash(presetname)) for presetname in self.Presets.keys())
+		state = repr((versions, contents))
+		return hashlib.md5(state.encode('utf-8')).hexdigest()
+
+	def _receive_sync_digest(self, address, message):
+		"""Request a snapshot if a peer sent changes this library missed or their libraries differ."""
+		expected = self._sync_peer_seqs.get(message['node'])
+		missed = expected is None or message['seq'] > expected
+		if missed or message['digest'] != self._sync_digest():
+			self._send_sync({'type': 'resync_request', 'node': self._sync_node}, [address])
+
+	def _drain_sync_messages(self):
+		"""Apply queued sync messages on the main thread."""
+		queue = self._sync_queue
+		while queue:
+			try:
+				address, message = queue.popleft()
+			except IndexError:
+				break
+			node = message.get('node')
+			if node == self._sync_node:
+				continue
+			try:
+				kind = message.get('type')
+				if kind == 'change':
+					self._receive_sync_change(address, message)
+				elif kind == 'resync_request':
+					self._send_sync_snapshot([address])
+				elif kind == 'snapshot':
+					self._merge_sync_snapshot(address, message)
+				elif kind == 'digest':
+					self._receive_sync_digest(address, message)
+			except Exception as e:
+				print(f"Warning: Could not apply sync message from {address[0]}:{address[1]}: {e}")
+
+	def _receive_sync_change(self, address, message):
+		"""Apply a peer's change record if it is newer; request a resync when records were missed."""
+		node = message['node']
+		expected = self._sync_peer_seqs.get(node)
+		self._sync_peer_seqs[node] = message['seq']
+		if expected is not None and message['seq'] != expected + 1:
+			self._send_sync({'type': 'resync_request', 'node': self._sync_node}, [address])
+
+		version = tuple(message['version'])
+		self._sync_clock = max(self._sync_clock, version[0])
+		record = message['record']
+		kind = record[0]
+
+		# Last writer wins per preset
+		records = []
+		if kind == 'save':
+			if version > self._sync_version(record[1]):
+				records.append(('save', record[1], record[2]))
+		elif kind == 'delete':
+			if version > self._sync_version(record[1]):
+				records.append(('delete', record[1]))
+		elif kind == 'rename':
+			if version > self._sync_version(record[1]):
+				records.append(('delete', record[1]))
+				self._sync_versions[record[1]] = version
+			if len(record) > 3 and version > self._sync_version(record[2]):
+				records.append(('save', record[2], record[3]))
+		elif kind == 'clear':
+			for presetname in list(self.Presets.keys()):
+				if version > self._sync_version(presetname):
+					records.append(('delete', presetname))
+		for applied in records:
+			self._sync_versions[applied[1]] = version
+		self._apply_sync_records(records)
+
+	def _send_sync_snapshot(self, peers, reply=False):
+		"""Send the whole library with its versions (full resync fallback)."""
+		presets = {presetname: self._read_preset_data(presetname) for presetname in self.Presets.keys()}
+		self._send_sync({'type': 'snapshot', 'node': self._sync_node, 'seq': self._sync_seq,
+			'presets': presets, 'versions': dict(self._sync_versions), 'reply': reply}, peers)
+
+	def _merge_sync_snapshot(self, address, message):
+		"""
+		Merge a peer's snapshot per preset by version, and answer once if this
+		library has newer presets. Presets with equal versions but different
+		contents (e.g. saved while not syncing) go to the larger content hash,
+		so both peers pick the same one.
+		"""
+		self._sync_peer_seqs[message['node']] = message['seq']
+		remote_presets = message['presets']
+		remote_versions = {name: tuple(version) for name, version in message['versions'].items()}
+		for presetname in remote_presets:
+			remote_versions.setdefault(presetname, (0, ''))
+		remote_hashes = {name: self._content_hash(data) for name, data in remote_presets.items()}
+
+		records = []
+		for presetname, version in remote_versions.items():
+			self._sync_clock = max(self._sync_clock, version[0])
+			local_version = self._sync_version(presetname)
+			if version == local_version and presetname in remote_presets:
+				# Tie: missing locally, or different contents resolved by hash
+				take = (presetname not in self.Presets
+					or remote_hashes[presetname] > self._preset_content_hash(presetname))
+			else:
+				take = version > local_version
+			if take:
+				if presetname in remote_presets:
+					records.append(('save', presetname, remote_presets[presetname]))
+				elif presetname in self.Presets:
+					records.append(('delete', presetname))
+				self._sync_versions[presetname] = version
+		self._apply_sync_records(records)
+
+		def local_wins(name):
+			version = self._sync_version(name)
+			remote_version = remote_versions.get(name, (0, ''))
+			if version == remote_version and name in self.Presets:
+				return (name not in remote_presets
+					or self._preset_content_hash(name) > remote_hashes[name])
+			return version > remote_version
+
+		newer = any(local_wins(name) for name in set(self.Presets.keys()) | set(self._sync_versions))
+		if newer and not message.get('reply'):
+			self._send_sync_snapshot([address], reply=True)
+
+	def _apply_sync_records(self, records):
+		"""Apply change records received from peers to the library (journaled, not re-published)."""
+		if not records:
+			return
+		presets = dict(self.Presets)
+		self._replay_records(presets, [
+			(record[0], record[1], self._encode_preset(record[1], record[2])) if record[0] == 'save' else record
+			for record in records])
+		self.Presets = presets
+		for record in records:
+			self._invalidate_preset_caches(record[1])
+			self._append_journal(record)
+		self.UpdatePresetNames()
+
+		if self.CurrentPresetName is not None and self.CurrentPresetName not in presets:
+			self.CurrentPresetName = None
+			self.UpdateMenu()
+		self.UpdateInfo()
+		print(f"Sync applied {len(records)} changes from peers")
+
+	def _pack_preset_rows(self, presetnames, target_ops):
+		"""
+		Pack several presets into aligned value rows over the union of their
+		numeric parameters. Parameters a preset does not store keep their live
+		value, so every row has the same slot layout.
+		Returns (rows, non_numeric) with rows as _pack_values dicts (one per
+		preset, sharing 'start' = live values), or None if rows cannot be aligned.
+		"""
+		# Collect every preset against the same live start values
+		merged = {}
+		per_preset = []
+		non_numeric = []
+		for presetname in presetnames:
+			plans = self._build_apply_plans(presetname, target_ops)
+			packed, preset_non_numeric = self._collect_lerp_values(plans)
+			values = {}
+			for item in packed:
+				key = tuple(item[4])
+				merged.setdefault(key, item)
+				values[key] = item[3]
+			per_preset.append(values)
+			non_numeric.append(preset_non_numeric)
+
+		# One row per preset over the union of parameters
+		merged = list(merged.items())
+		rows = []
+		for values in per_preset:
+			packed = []
+			for key, (par_name, par, start_val, target_val, channel_names, kind) in merged:
+				value = values.get(key, start_val)
+				# Keep rows aligned: a shape mismatch falls back to the live value
+				if isinstance(start_val, (list, tuple)):
+					if not isinstance(value, (list, tuple)) or len(value) != len(start_val):
+						value = start_val
+				elif isinstance(value, (list, tuple)):
+					value = start_val
+				packed.append((par_name, par, start_val, value, channel_names, kind))
+			rows.append(self._pack_values(packed))
+
+		if any(row['target'].size != rows[0]['target'].size for row in rows):
+			return None
+		return rows, non_numeric
+
+	def _rows_moving_mask(self, matrix, start):
+		"""Return the slots that differ between the rows of matrix or from the live start values."""
+		return (matrix != matrix[0]).any(axis=0) | (matrix[0] != start)
+
+	# ---------- Preset Blending ----------
+	def StartBlend(self, presetnames, positions=None, weights=None):
+		"""
+		Prepare a weighted blend of several presets (e.g. for an XY pad).
+		The presets' numeric values are packed into one matrix (one row per
+		preset); parameters a preset does not store keep their current value.
+		positions: optional [(x, y), ...] per preset for SetBlendXY
+		weights: optional initial weights (applied immediately)
+		Stops a running main lerp. Returns the number of blended parameters.
+		"""
+		presetnames = [name for name in presetnames if name in self.Presets]
+		if not presetnames:
+			print("Warning: No valid presets to blend")
+			return 0
+
+		target_ops = self._get_target_ops()
+		if not target_ops:
+			return 0
+
+		if self._lerp_active:
+			self._cancel_lerp()
+
+		packed_rows = self._pack_preset_rows(presetnames, target_ops)
+		if packed_rows is None:
+			print("Warning: Presets could not be aligned for blending")
+			return 0
+		rows, non_numeric = packed_rows
+
+		self._blend_presets = presetnames
+		self._blend_matrix = np.vstack([row['target'] for row in rows])
+		self._blend_writes = rows[0]['writes']
+		self._blend_channel_names = rows[0]['channel_names']
+		self._blend_non_numeric = non_numeric
+		self._blend_buffer = rows[0]['start'].copy()
+		self._blend_dominant = -1
+		self._blend_weights = None
+		self._blend_positions = [tuple(p) for p in positions] if positions is not None else None
+
+		self._blend_write_index = self._make_write_index(
+			self._blend_writes, self._rows_moving_mask(self._blend_matrix, rows[0]['start']))
+		self._blend_written = np.full(self._blend_buffer.size, np.nan)
+
+		print(f"Blend prepared with {len(presetnames)} presets ({len(self._blend_writes)} numeric parameters)")
+		if weights is not None:
+			self.SetBlendWeights(weights)
+		return len(self._blend_writes)
+
+	def StopBlend(self):
+		"""Stop blending. Parameters keep their last blended values."""
+		self._blend_presets = []
+		self._blend_matrix = None
+		self._blend_writes = []
+		self._blend_write_index = None
+		self._blend_written = None
+		self._blend_non_numeric = []
+		self._blend_weights = None
+		self._blend_positions = None
+		self._blend_weight_source = None
+		self._update_execute_active()
+
+	def SetBlendWeights(self, weights):
+		"""
+		Blend the presets with the given weights and write the result.
+		weights: list/array in StartBlend order, or {presetname: weight}.
+		Weights are normalized to sum 1. Numeric parameters are combined in one
+		vectorized step; non-numeric parameters follow the dominant weight.
+		"""
+		if self._blend_matrix is None:
+			print("Warning: No blend prepared, call StartBlend first")
+			return False
+
+		if isinstance(weights, dict):
+			weights = [weights.get(name, 0.0) for name in self._blend_presets]
+		weights = np.asarray(weights, dtype=np.float64).ravel()[:len(self._blend_presets)]
+		if weights.size < len(self._blend_presets):
+			weights = np.concatenate((weights, np.zeros(len(self._blend_presets) - weights.size)))
+		total = weights.sum()
+		if total <= 0.0:
+			return False
+		weights = weights / total
+
+		if self._blend_weights is not None and np.array_equal(weights, self._blend_weights):
+			return True
+		self._blend_weights = weights
+
+		np.dot(weights, self._blend_matrix, out=self._blend_buffer)
+		self._write_changed_values(self._blend_write_index, self._blend_buffer, self._blend_written)
+
+		dominant = int(np.argmax(weights))
+		if dominant != self._blend_dominant:
+			self._blend_dominant = dominant
+			self._apply_values(self._blend_non_numeric[dominant])
+			self.CurrentPresetName = self._blend_presets[dominant]
+			self.Has_changed = weights[dominant] < 1.0
+			self.UpdateInfo()
+		return True
+
+	def SetBlendXY(self, x, y, power=2.0):
+		"""
+		Blend by a 2D position, e.g. from an XY pad: presets are weighted by
+		inverse distance to their StartBlend positions.
+		"""
+		if self._blend_positions is None:
+			print("Warning: Blend has no preset positions, pass positions to StartBlend")
+			return False
+		points = np.asarray(self._blend_positions, dtype=np.float64)
+		distances = np.hypot(points[:, 0] - x, points[:, 1] - y)
+		exact = distances < 1e-9
+		if exact.any():
+			return self.SetBlendWeights(exact.astype(np.float64))
+		return self.SetBlendWeights(1.0 / np.power(distances, power))
+
+	def SetBlendWeightSource(self, chop):
+		"""
+		Read blend weights from a CHOP every frame: channel i is the weight of
+		preset i (last sample). None stops polling.
+		"""
+		if chop is not None and self._blend_matrix is None:
+			print("Warning: No blend prepared, call StartBlend first")
+			return False
+		self._blend_weight_source = chop
+		self._update_execute_active()
+		return True
+
+	def _poll_blend_weight_source(self):
+		"""Apply the weights of the blend weight CHOP (only changes are written)."""
+		try:
+			weights = self._blend_weight_source.numpyArray()[:, -1]
+		except Exception:
+			print("Warning: Blend weight CHOP became invalid, stopping weight polling")
+			self._blend_weight_source = None
+			self._update_execute_active()
+			return
+		self.SetBlendWeights(weights)
+
+	def GetBlendChannelNames(self):
+		"""Return the channel names of the blend buffer (one per value component)."""
+		return list(self._blend_channel_names)
+
+	def GetBlendChannelBuffer(self):
+		"""Return the blend output buffer (float64 numpy array, one value per channel), None before StartBlend."""
+		return self._blend_buffer
+
+	# ---------- Spline Path ----------
+	def PreparePath(self, presetnames, closed=False):
+		"""
+		Prepare a smooth Catmull-Rom path through an ordered list of presets.
+		Cubic coefficients are precomputed once per segment, so evaluating the
+		path at any position costs one vectorized polynomial step.
+		closed: connect the last preset back to the first.
+		Stops a running main lerp. Returns the number of path parameters.
+		"""
+		presetnames = [name for name in presetnames if name in self.Presets]
+		if len(presetnames) < 2:
+			print("Warning: A path needs at least 2 valid presets")
+			return 0
+
+		target_ops = self._get_target_ops()
+		if not target_ops:
+			return 0
+
+		if self._lerp_active:
+			self._cancel_lerp()
+		self.StopPath()
+
+		packed_rows = self._pack_preset_rows(presetnames, target_ops)
+		if packed_rows is None:
+			print("Warning: Presets could not be aligned for the path")
+			return 0
+		rows, non_numeric = packed_rows
+
+		points = np.vstack([row['target'] for row in rows])
+		self._path_presets = presetnames
+		self._path_coeffs = self._catmull_rom_coefficients(points, closed)
+		self._path_writes = rows[0]['writes']
+		self._path_channel_names = rows[0]['channel_names']
+		self._path_non_numeric = non_numeric
+		self._path_buffer = rows[0]['start'].copy()
+		self._path_write_index = self._make_write_index(
+			self._path_writes, self._rows_moving_mask(points, rows[0]['start']))
+		self._path_written = np.full(self._path_buffer.size, np.nan)
+		self._path_position = 0.0
+		self._path_point = -1
+
+		print(f"Path prepared through {len(presetnames)} presets ({len(self._path_writes)} numeric parameters)")
+		return len(self._path_writes)
+
+	def _catmull_rom_coefficients(self, points, closed=False):
+		"""
+		Compute uniform Catmull-Rom coefficients for consecutive points.
+		points: (n, slots) array. Returns (segments, 4, slots) array of
+		(a, b, c, d) with segment value a + b*u + c*u^2 + d*u^3, u in [0, 1].
+		Open paths repeat the end points as outer control points.
+		"""
+		if closed:
+			p0 = np.roll(points, 1, axis=0)
+			p1 = points
+			p2 = np.roll(points, -1, axis=0)
+			p3 = np.roll(points, -2, axis=0)
+		else:
+			padded = np.vstack((points[:1], points, points[-1:]))
+			p0 = padded[:-3]
+			p1 = padded[1:-2]
+			p2 = padded[2:-1]
+			p3 = padded[3:]
+		return np.stack((
+			p1,
+			0.5 * (p2 - p0),
+			0.5 * (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3),
+			0.5 * (3.0 * (p1 - p2) + p3 - p0),
+		), axis=1)
+
+	def _path_values_at(self, position, out):
+		"""Evaluate the path at position in [0, 1] into out. Returns the nearest point index."""
+		segments = self._path_coeffs.shape[0]
+		s = min(max(position, 0.0), 1.0) * segments
+		segment = min(int(s), segments - 1)
+		u = s - segment
+		a, b, c, d = self._path_coeffs[segment]
+		# Horner form: ((d*u + c)*u + b)*u + a
+		np.multiply(d, u, out=out)
+		out += c
+		out *= u
+		out += b
+		out *= u
+		out += a
+		return (segment + (1 if u >= 0.5 else 0)) % len(self._path_presets)
+
+	def SetPathPosition(self, position):
+		"""
+		Scrub the path to position in [0, 1] (0 = first preset, 1 = last, or
+		back to the first for closed paths) and write the values.
+		Non-numeric parameters follow the nearest preset on the path.
+		"""
+		if self._path_coeffs is None:
+			print("Warning: No path prepared, call PreparePath first")
+			return False
+		self._path_position = min(max(float(position), 0.0), 1.0)
+		point = self._path_values_at(self._path_position, self._path_buffer)
+		self._write_changed_values(self._path_write_index, self._path_buffer, self._path_written)
+		if point != self._path_point:
+			self._path_point = point
+			self._apply_values(self._path_non_numeric[point])
+			self.CurrentPresetName = self._path_presets[point]
+			self.UpdateInfo()
+		return True
+
+	def PlayPath(self, duration, easing=None, loop=False, start=None):
+		"""
+		Play the prepared path over duration seconds.
+		easing: easing method applied to the whole path (None = linear)
+		loop: restart at the beginning when the end is reached
+		start: start position in [0, 1] (None = continue from the current position,
+			or restart when at the end)
+		"""
+		if self._path_coeffs is None:
+			print("Warning: No path prepared, call PreparePath first")
+			return False
+		if start is None:
+			start = 0.0 if self._path_position >= 1.0 else self._path_position
+		self._path_origin = min(max(float(start), 0.0), 1.0)
+		self._path_duration = max(float(duration), 1e-6)
+		self._path_easing = easing
+		self._path_loop = loop
+		self._path_start_time = absTime.seconds
+		self._path_playing = True
+		self._update_execute_active()
+		return True
+
+	def StopPath(self):
+		"""Stop path playback. Parameters keep their current values."""
+		if self._path_playing:
+			self._path_playing = False
+			self._update_execute_active()
+
+	def GetPathState(self):
+		"""Return a dict describing the prepared path."""
+		return {
+			'presets': list(self._path_presets),
+			'position': self._path_position,
+			'playing': self._path_playing,
+			'loop': self._path_loop,
+			'duration': self._path_duration,
+			'channels': len(self._path_channel_names),
+		}
+
+	def _advance_path(self):
+		"""Advance path playback by one frame."""
+		progress = self._path_origin + (absTime.seconds - self._path_start_time) / self._path_duration
+		if progress >= 1.0:
+			if self._path_loop:
+				progress %= 1.0
+			else:
+				progress = 1.0
+				self._path_playing = False
+				self._update_execute_active()
+		position = progress
+		if self._path_easing:
+			position = self._get_easing_function(self._path_easing)(progress)
+		self.SetPathPosition(position)
+		# Keep the raw position so PlayPath continues where playback stopped
+		self._path_position = progress
+
+	# ---------- Nearest Preset ----------
+	def FindNearestPresets(self, k=1, values=None):
+		"""
+		Find the k stored presets closest to the live state of Targetop
+		(or to values, a {par_name: value} dict).
+		Numeric parameters are normalized by the target's normMin/normMax and
+		compared as a root-mean-square distance over the parameters both have.
+		All presets are searched with one vectorized distance computation.
+		Returns [(presetname, distance), ...] sorted by distance.
+		"""
+		matrix = self._get_nearest_matrix()
+		count = len(self._nearest_names)
+		if count == 0:
+			return []
+
+		target_op = self._get_target_op()
+		if target_op is None:
+			return []
+
+		columns = self._nearest_columns
+		query = np.full(len(columns), np.nan)
+		if values is None:
+			for column, index in columns.items():
+				par_name, component = self._split_nearest_column(column)
+				par = self._resolve_par(target_op, par_name)
+				if par is None:
+					continue
+				try:
+					val = par.eval()
+					query[index] = float(val[component] if component is not None else val)
+				except Exception:
+					pass
+		else:
+			for column, value in self._numeric_columns(values):
+				index = columns.get(column)
+				if index is not None:
+					query[index] = value
+
+		# One vectorized pass over all presets; missing values are ignored
+		diff = (matrix[:count, :len(columns)] - query) * self._get_nearest_scale(target_op)
+		valid = ~np.isnan(diff)
+		diff[~valid] = 0.0
+		used = valid.sum(axis=1)
+		distances = np.sqrt((diff * diff).sum(axis=1) / np.maximum(used, 1))
+		distances[used == 0] = np.inf
+
+		k = max(1, min(int(k), count))
+		if k < count:
+			nearest = np.argpartition(distances, k - 1)[:k]
+		else:
+			nearest = np.arange(count)
+		nearest = nearest[np.argsort(distances[nearest])]
+		return [(self._nearest_names[i], float(distances[i])) for i in nearest.tolist()]
+
+	def GetNearestPreset(self):
+		"""Return the name of the stored preset closest to the live state of Targetop, or None."""
+		nearest = self.FindNearestPresets(1)
+		return nearest[0][0] if nearest else None
+
+	def SelectNearestPreset(self, tolerance=1e-6):
+		"""
+		Make the nearest stored preset the current one without loading it,
+		e.g. after manual tweaks. It is shown as changed in Monitorstr unless the
+		live state is within tolerance. Returns (presetname, distance) or None.
+		"""
+		nearest = self.FindNearestPresets(1)
+		if not nearest:
+			return None
+		presetname, distance = nearest[0]
+		self.CurrentPresetName = presetname
+		self.Has_changed = distance > tolerance
+		self.UpdateInfo()
+		self._menu_select_only = presetname
+		self.UpdateMenu()
+		return presetname, distance
+
+	def _numeric_columns(self, pars_dict):
+		"""Yield (column name, float value) for the numeric values of a preset dict."""
+		for par_name, value in pars_dict.items():
+			if isinstance(value, (int, float)):
+				yield par_name, float(value)
+			elif isinstance(value, (list, tuple)) and value and all(isinstance(v, (int, float)) for v in value):
+				for i, v in enumerate(value):
+					yield f'{par_name}[{i}]', float(v)
+
+	def _split_nearest_column(self, column):
+		"""Split a column name into (par_name, component index or None)."""
+		if column.endswith(']') and '[' in column:
+			par_name, component = column[:-1].split('[', 1)
+			return par_name, int(component)
+		return column, None
+
+	def _get_nearest_matrix(self):
+		"""Return the preset value matrix, building it from all presets if needed."""
+		self._check_library()
+		if self._nearest_matrix is None:
+			self._nearest_matrix = np.full((max(len(self.Presets), 16), 16), np.nan)
+			self._nearest_rows = {}
+			self._nearest_names = []
+			self._nearest_columns = {}
+			self._nearest_scale_key = None
+			for presetname in self.Presets.keys():
+				self._update_nearest_row(presetname)
+		return self._nearest_matrix
+
+	def _update_nearest_row(self, presetname):
+		"""Insert, replace or remove one preset's row in the value matrix."""
+		if self._nearest_matrix is None:
+			# Not built yet, the first query builds it from all presets
+			return
+
+		row = self._nearest_rows.get(presetname)
+		if presetname not in self.Presets:
+			if row is not None:
+				# Move the last row into the freed slot
+				last = len(self._nearest_names) - 1
+				last_name = self._nearest_names[last]
+				self._nearest_matrix[row] = self._nearest_matrix[last]
+				self._nearest_matrix[last] = np.nan
+				self._nearest_names[row] = last_name
+				self._nearest_rows[last_name] = row
+				self._nearest_names.pop()
+				del self._nearest_rows[presetname]
+			return
+
+		values = list(self._numeric_columns(self._read_preset_data(presetname)))
+		for column, _value in values:
+			if column not in self._nearest_columns:
+				self._nearest_columns[column] = len(self._nearest_columns)
+		rows, cols = self._nearest_matrix.shape
+		needed_rows = len(self._nearest_names) + (1 if row is None else 0)
+		if needed_rows > rows or len(self._nearest_columns) > cols:
+			# Grow by doubling so repeated saves stay amortized O(1)
+			grown = np.full((max(rows, needed_rows * 2), max(cols, len(self._nearest_columns) * 2)), np.nan)
+			grown[:rows, :cols] = self._nearest_matrix
+			self._nearest_matrix = grown
+
+		if row is None:
+			row = len(self._nearest_names)
+			self._nearest_names.append(presetname)
+			self._nearest_rows[presetname] = row
+		self._nearest_matrix[row] = np.nan
+		for column, value in values:
+			self._nearest_matrix[row, self._nearest_columns[column]] = value
+
+	def _get_nearest_scale(self, target_op):
+		"""Return 1 / (normMax - normMin) per column for target_op, cached per column layout."""
+		key = (target_op.path, len(self._nearest_columns))
+		if self._nearest_scale_key != key:
+			scale = np.ones(len(self._nearest_columns))
+			for column, index in self._nearest_columns.items():
+				par = self._resolve_par(target_op, self._split_nearest_column(column)[0])
+				try:
+					span = float(par.normMax) - float(par.normMin)
+					if span > 0.0:
+						scale[index] = 1.0 / span
+				except Exception:
+					pass
+			self._nearest_scale = scale
+			self._nearest_scale_key = key
+		return self._nearest_scale
+
+	# ---------- Sequencer ----------
+	def SetPlaylist(self, steps, loop=False):
+		"""
+		Set the sequencer playlist and stop playback.
+		steps is an ordered list; each step is a preset name, a tuple
+		(presetname, hold, lerptime, easing) or a dict with those keys.
+		hold: seconds to stay on the preset after its transition (default 1.0)
+		lerptime: transition time in seconds, 0 for an instant load (default 0.0)
+		easing: easing method name, None uses Lerpmethods (default None)
+		Returns the number of steps.
+		"""
+		self.StopSequence()
+		self._seq_steps = [self._normalize_step(step) for step in steps]
+		self._seq_loop = bool(loop)
+		self._seq_index = -1
+		return len(self._seq_steps)
+
+	def _normalize_step(self, step):
+		"""Convert a playlist step (name, tuple or dict) to a step dict."""
+		keys = ('preset', 'hold', 'lerptime', 'easing')
+		normalized = {'preset': None, 'hold': 1.0, 'lerptime': 0.0, 'easing': None}
+		if isinstance(step, str):
+			normalized['preset'] = step
+		elif isinstance(step, dict):
+			normalized.update({k: step[k] for k in keys if k in step})
+		else:
+			normalized.update(dict(zip(keys, step)))
+		normalized['hold'] = max(float(normalized['hold'] or 0.0), 0.0)
+		normalized['lerptime'] = max(float(normalized['lerptime'] or 0.0), 0.0)
+		return normalized
+
+	def SetSequenceLoop(self, loop):
+		"""Enable or disable looping back to the first step after the last one."""
+		self._seq_loop = bool(loop)
+		# The step after the last one changes, prepare it again
+		self._seq_prepared = {}
+		self._schedule_prefetch()
+
+	def PlaySequence(self, index=None):
+		"""
+		Start or resume sequencer playback.
+		If paused and index is None, resumes where it was paused.
+		Otherwise starts at step index (default: first step).
+		"""
+		if not self._seq_steps:
+			print("Warning: Sequencer playlist is empty")
+			return False
+
+		if index is None and self._seq_paused:
+			paused_for = absTime.seconds - self._seq_pause_time
+			self._seq_step_start += paused_for
+			self.ResumeLerp()
+			self._seq_paused = False
+			self._seq_pause_time = None
+			return True
+
+		if index is None and self._seq_playing:
+			return True
+
+		return self.JumpToStep(0 if index is None else index)
+
+	def PauseSequence(self):
+		"""Pause sequencer playback, freezing the current step and its transition."""
+		if not self._seq_playing or self._seq_paused:
+			return False
+		self._seq_paused = True
+		self._seq_pause_time = absTime.seconds
+		self.PauseLerp()
+		return True
+
+	def StopSequence(self):
+		"""Stop sequencer playback. A running transition finishes unless it was paused."""
+		if self._seq_paused and self._lerp_active:
+			self._cancel_lerp()
+		self._seq_playing = False
+		self._seq_paused = False
+		self._seq_pause_time = None
+		self._seq_prepared = {}
+		self._update_execute_active()
+
+	def JumpToStep(self, index):
+		"""
+		Jump to playlist step index (negative indices count from the end)
+		and start its transition immediately. Resumes playback if paused.
+		"""
+		count = len(self._seq_steps)
+		if count == 0:
+			print("Warning: Sequencer playlist is empty")
+			return False
+		if not -count <= index < count:
+			print(f"Warning: Sequencer step {index} out of range (0-{count - 1})")
+			return False
+
+		self._seq_playing = True
+		self._seq_paused = False
+		self._seq_pause_time = None
+		self.ResumeLerp()
+		started = self._start_step(index % count)
+		self._update_execute_active()
+		return started
+
+	def NextStep(self):
+		"""Jump to the next playlist step (wraps when looping)."""
+		next_index = self._next_step_index()
+		if next_index is None:
+			return False
+		return self.JumpToStep(next_index)
+
+	def PrevStep(self):
+		"""Jump to the previous playlist step (wraps when looping)."""
+		if self._seq_index > 0:
+			return self.JumpToStep(self._seq_index - 1)
+		if self._seq_loop and self._seq_steps:
+			return self.JumpToStep(len(self._seq_steps) - 1)
+		return False
+
+	def GetSequenceState(self):
+		"""Return a dict describing the sequencer state."""
+		return {
+			'playing': self._seq_playing,
+			'paused': self._seq_paused,
+			'loop': self._seq_loop,
+			'index': self._seq_index,
+			'count': len(self._seq_steps),
+			'step': self._seq_steps[self._seq_index] if 0 <= self._seq_index < len(self._seq_steps) else None,
+			'prepared': sorted(self._seq_prepared.keys()),
+		}
+
+	def _next_step_index(self):
+		"""Return the index of the step after the current one, or None at the end."""
+		next_index = self._seq_index + 1
+		if next_index < len(self._seq_steps):
+			return next_index
+		if self._seq_loop and self._seq_steps:
+			return 0
+		return None
+
+	def _start_step(self, index, start_time=None):
+		"""
+		Start the transition of playlist step index.
+		Uses the prefetched apply plan when it is still current.
+		"""
+		step = self._seq_steps[index]
+		self._seq_index = index
+		self._seq_step_start = absTime.seconds if start_time is None else start_time
+
+		presetname = step['preset']
+		if presetname not in self.Presets:
+			print(f"Warning: Sequencer step {index}: preset '{presetname}' not found, skipping")
+			self._schedule_prefetch()
+			return False
+
+		target_ops = self._get_target_ops()
+		if not target_ops:
+			self.StopSequence()
+			return False
+
+		plans = self._seq_prepared.pop(index, None)
+		if not self._plans_are_current(plans, target_ops):
+			plans = self._build_apply_plans(presetname, target_ops)
+
+		if step['lerptime'] > 0.001:
+			self._load_plans_with_lerp(plans, step['lerptime'], step['easing'])
+		else:
+			# An instant load must not be overwritten by a running lerp
+			if self._lerp_active:
+				self._cancel_lerp()
+			self.CurrentPresetName = presetname
+			self._load_plans(plans)
+
+		self._schedule_prefetch()
+		return True
+
+	def _update_sequencer(self):
+		"""Advance to the next step once the current step's transition and hold are over."""
+		if self._seq_paused or not 0 <= self._seq_index < len(self._seq_steps):
+			return
+
+		step = self._seq_steps[self._seq_index]
+		step_end = self._seq_step_start + step['lerptime'] + step['hold']
+		if absTime.seconds < step_end:
+			return
+
+		next_index = self._next_step_index()
+		if next_index is None:
+			self._seq_playing = False
+			self._seq_prepared = {}
+			self._update_execute_active()
+			print("Sequence finished")
+			return
+
+		# Start from the scheduled end time so step timing does not drift with frame rate
+		self._start_step(next_index, start_time=step_end)
+
+	def _schedule_prefetch(self):
+		"""Prepare the next step's apply plan on a later frame, off the transition frame."""
+		if self._seq_prefetch_pending or not self._seq_playing:
+			return
+		next_index = self._next_step_index()
+		if next_index is None or next_index in self._seq_prepared:
+			return
+		self._seq_prefetch_pending = True
+		run(lambda: self._prefetch_next_step(), delayFrames=1)
+
+	def _prefetch_next_step(self):
+		"""Resolve and pack the next step's preset into apply plans."""
+		self._seq_prefetch_pending = False
+		if not self._seq_playing:
+			return
+		next_index = self._next_step_index()
+		if next_index is None:
+			return
+		presetname = self._seq_steps[next_index]['preset']
+		if presetname not in self.Presets:
+			return
+		target_ops = self._get_target_ops()
+		if not target_ops:
+			return
+		# Only the upcoming step is kept prepared
+		self._seq_prepared = {next_index: self._build_apply_plans(presetname, target_ops)}
+
+	# ---------- Remote Control (OSC) ----------
+	def StartRemote(self, port=None, host='0.0.0.0', prefix=None):
+		"""
+		Listen for OSC messages over UDP and map them to preset recall.
+		Socket reads and OSC parsing run on a background thread; commands are
+		handed over through a deque and executed on the main thread once per frame.
+		port: UDP port (None = Remoteport parameter, else REMOTE_PORT)
+		prefix: OSC address prefix (default '/presetter'), addresses:
+			<prefix>/load s:preset
+			<prefix>/lerp s:preset f:seconds [s:easing]
+			<prefix>/blend f:weight ...    (weights in StartBlend order)
+			<prefix>/blendxy f:x f:y
+			<prefix>/step i:index, <prefix>/next, <prefix>/prev,
+			<prefix>/play, <prefix>/pause, <prefix>/stop
+		"""
+		import collections
+		import socket
+		import threading
+
+		self.StopRemote()
+		if port is None:
+			try:
+				port = int(self.ownerComp.par.Remoteport.eval())
+			except Exception:
+				port = REMOTE_PORT
+		if prefix is not None:
+			self._remote_prefix = prefix.rstrip('/')
+
+		try:
+			sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+			sock.bind((host, port))
+			sock.settimeout(SOCKET_POLL_SECONDS)
+		except OSError as e:
+			print(f"Warning: Could not listen on UDP port {port}: {e}")
+			return False
+
+		self._remote_socket = sock
+		self._remote_queue = collections.deque()
+		self._remote_latencies = collections.deque(maxlen=1000)
+		self._remote_thread = threading.Thread(
+			target=self._remote_loop, args=(sock, self._remote_queue),
+			name=f'Presetter remote {port}', daemon=True)
+		self._remote_thread.start()
+		self._update_execute_active()
+		print(f"Remote control listening on UDP {host}:{sock.getsockname()[1]}")
+		return True
+
+	def StopRemote(self):
+		"""Stop the remote control listener. Already queued commands are dropped."""
+		if self._remote_thread is None:
+			return
+		thread = self._remote_thread
+		sock = self._remote_socket
+		self._remote_thread = None
+		self._remote_socket = None
+		self._remote_queue = None
+		# The thread leaves its loop after its current recv times out; the port
+		# is only free again once no recv is pending on the socket
+		thread.join(SOCKET_POLL_SECONDS * 2)
+		try:
+			sock.close()
+		except OSError:
+			pass
+		self._update_execute_active()
+
+	def onDestroyTD(self):
+		"""Called by TouchDesigner before the extension is re-initialized or destroyed."""
+		# Release the UDP ports, the re-initialized extension binds them again
+		self.StopRemote()
+		self.StopSync()
+
+	def GetRemoteStats(self):
+		"""
+		Return latency statistics of executed remote commands, measured from
+		packet arrival to the end of the command (parameter writes included).
+		Returns dict: 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms' ('port' if listening)
+		"""
+		latencies = sorted(self._remote_latencies or [])
+		stats = {'count': len(latencies)}
+		if self._remote_socket is not None:
+			stats['port'] = self._remote_socket.getsockname()[1]
+		if latencies:
+			stats.update({
+				'mean_ms': sum(latencies) / len(latencies) * 1000.0,
+				'p50_ms': latencies[len(latencies) // 2] * 1000.0,
+				'p95_ms': latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000.0,
+				'max_ms': latencies[-1] * 1000.0,
+			})
+		return stats
+
+	def BenchmarkRemoteLatency(self, presetname, count=100, timeout=1.0):
+		"""
+		Measure remote recall latency over loopback: sends count '<prefix>/load'
+		messages to the running listener and executes each as soon as it is
+		queued, so the result excludes the wait for the next frame (add up to
+		one frame for normal per-frame draining).
+		timeout: seconds to wait for a message; the benchmark stops at the
+			first message that does not arrive, so it never blocks longer
+		Returns the GetRemoteStats() dict of the benchmark messages, with
+		'lost' set to the number of messages not measured.
+		"""
+		import collections
+		import contextlib
+		import io
+		import socket
+
+		if self._remote_socket is None:
+			print("Warning: Remote control is not running, call StartRemote first")
+			return None
+
+		port = self._remote_socket.getsockname()[1]
+		packet = self._build_osc(self._remote_prefix + '/load', str(presetname))
+		self._remote_latencies = collections.deque(maxlen=max(int(count), 1))
+		sent = 0
+		sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		try:
+			with contextlib.redirect_stdout(io.StringIO()):
+				for _ in range(int(count)):
+					sender.sendto(packet, ('127.0.0.1', port))
+					sent += 1
+					deadline = time.perf_counter() + timeout
+					while not self._remote_queue and time.perf_counter() < deadline:
+						time.sleep(0)
+					if not self._remote_queue:
+						# Lost or the listener stalled, waiting for more would only repeat the timeout
+						break
+					self._drain_remote_commands()
+		finally:
+			sender.close()
+
+		stats = self.GetRemoteStats()
+		stats['lost'] = int(count) - stats['count']
+		if stats['count']:
+			print(f"Remote latency over {stats['count']} messages: mean {stats['mean_ms']:.3f} ms, "
+				f"p95 {stats['p95_ms']:.3f} ms, max {stats['max_ms']:.3f} ms")
+		if stats['lost']:
+			print(f"Warning: {stats['lost']} of {int(count)} benchmark messages were not received "
+				f"(stopped after {sent} sent, {timeout} s timeout)")
+		return stats
+
+	def _remote_loop(self, sock, queue):
+		"""Listener thread: receive, parse and queue OSC messages. Never touches TouchDesigner objects."""
+		while self._remote_socket is sock:
+			try:
+				data = sock.recv(65536)
+			except OSError:
+				# Timeout (check for stop) or socket closed
+				continue
+			arrival = time.perf_counter()
+			try:
+				messages = self._parse_osc(data)
+			except Exception:
+				continue
+			for address, args in messages:
+				queue.append((arrival, address, args))
+
+	def _drain_remote_commands(self):
+		"""Execute all queued remote commands on the main thread."""
+		queue = self._remote_queue
+		while queue:
+			try:
+				arrival, address, args = queue.popleft()
+			except IndexError:
+				break
+			try:
+				self._dispatch_remote(address, args)
+			except Exception as e:
+				print(f"Warning: Remote command '{address}' failed: {e}")
+			if self._remote_latencies is not None:
+				self._remote_latencies.append(time.perf_counter() - arrival)
+
+	def _dispatch_remote(self, address, args):
+		"""Map one OSC message to a preset, blend or sequencer call."""
+		if not address.startswith(self._remote_prefix + '/'):
+			return
+		command = address[len(self._remote_prefix) + 1:]
+		if command == 'load':
+			self.LoadPreset(str(args[0]))
+		elif command == 'lerp':
+			easing = str(args[2]) if len(args) > 2 else None
+			self.LoadPresetWithLerp(str(args[0]), float(args[1]), easing)
+		elif command == 'blend':
+			self.SetBlendWeights([float(a) for a in args])
+		elif command == 'blendxy':
+			self.SetBlendXY(float(args[0]), float(args[1]))
+		elif command == 'step':
+			self.JumpToStep(int(args[0]))
+		elif command == 'next':
+			self.NextStep()
+		elif command == 'prev':
+			self.PrevStep()
+		elif command == 'play':
+			self.PlaySequence()
+		elif command == 'pause':
+			self.PauseSequence()
+		elif command == 'stop':
+			self.StopSequence()
+		else:
+			print(f"Warning: Unknown remote command '{address}'")
+
+	def _parse_osc(self, data):
+		"""Parse an OSC packet (message or bundle). Returns [(address, [args]), ...]."""
+		import struct
+
+		if data.startswith(b'#bundle\0'):
+			messages = []
+			i = 16  # '#bundle\0' + 8 byte time tag
+			while i + 4 <= len(data):
+				size = struct.unpack_from('>i', data, i)[0]
+				i += 4
+				messages.extend(self._parse_osc(data[i:i + size]))
+				i += size
+			return messages
+
+		address, i = self._read_osc_string(data, 0)
+		if not address.startswith('/'):
+			return []
+		tags = ','
+		if i < len(data):
+			tags, i = self._read_osc_string(data, i)
+
+		args = []
+		for tag in tags[1:]:
+			if tag == 'i':
+				args.append(struct.unpack_from('>i', data, i)[0])
+				i += 4
+			elif tag == 'f':
+				args.append(struct.unpack_from('>f', data, i)[0])
+				i += 4
+			elif tag == 'd':
+				args.append(struct.unpack_from('>d', data, i)[0])
+				i += 8
+			elif tag == 'h':
+				args.append(struct.unpack_from('>q', data, i)[0])
+				i += 8
+			elif tag == 's':
+				value, i = self._read_osc_string(data, i)
+				args.append(value)
+			elif tag in 'TF':
+				args.append(tag == 'T')
+			elif tag == 'N':
+				args.append(None)
+			else:
+				# Unsupported type tag, the remaining arguments cannot be decoded
+				break
+		return [(address, args)]
+
+	def _read_osc_string(self, data, i):
+		"""Read a null-terminated, 4-byte padded OSC string. Returns (string, next index)."""
+		end = data.index(b'\0', i)
+		return data[i:end].decode('utf-8', 'replace'), (end + 4) & ~3
+
+	def _build_osc(self, address, *args):
+		"""Encode an OSC message with int, float and string arguments."""
+		import struct
+
+		def osc_string(value):
+			encoded = value.encode('utf-8') + b'\0'
+			return encoded + b'\0' * (-len(encoded) % 4)
+
+		tags = ','
+		payload = b''
+		for arg in args:
+			if isinstance(arg, bool) or arg is None:
+				tags += 'N' if arg is None else ('T' if arg else 'F')
+			elif isinstance(arg, int):
+				tags += 'i'
+				payload += struct.pack('>i', arg)
+			elif isinstance(arg, float):
+				tags += 'f'
+				payload += struct.pack('>f', arg)
+			else:
+				tags += 's'
+				payload += osc_string(str(arg))
+		return osc_string(address) + osc_string(tags) + payload
+
+	# ---------- Callback Handlers ----------
+	def OnPresetmenu(self, par):
+		"""Callback for Presetmenu - updates CurrentPresetName and loads preset when menu selection changes."""
+		try:
+			menu_val = par.eval()
+			if menu_val is not None and menu_val == self._menu_select_only:
+				# Menu was only synced to the nearest preset, keep the live values
+				self._menu_select_only = None
+				return
+			if menu_val and menu_val != 'None':
+				# Update CurrentPresetName to match menu selection
+				self.CurrentPresetName = menu_val
+				# Check if Lerp toggle is enabled
+				try:
+					lerp_enabled = self.ownerComp.par.Lerp.eval()
+					if lerp_enabled:
+						# Get lerp time and use lerp loading
+						lerptime = self.ownerComp.par.Lerptime.eval()
+						self.LoadPresetWithLerp(menu_val, lerptime)
+					else:
+						# Load the preset values to target OP (instant)
+						self.LoadPreset(menu_val)
+				except Exception:
+					# Lerp parameters might not exist, fall back to instant load
+					self.LoadPreset(menu_val)
+			else:
+				# 'None' selected
+				self.CurrentPresetName = None
+				self.UpdateInfo()
+		except Exception as e:
+			print(f"Warning: Could not update preset from menu: {e}")
+
+	def OnSave(self, par):
+		"""Callback for Save button - saves preset with auto-increment naming."""
+		# Get preset name from Savename parameter if available
+		preset_name = None
+		try:
+			savename_par = self.ownerComp.par.Savename
+			if savename_par:
+				savename_val = savename_par.eval()
+				if savename_val and savename_val.strip():
+					preset_name = savename_val.strip()
+		except Exception:
+			pass
+		
+		# If Savename is empty, use None to trigger auto-increment
+		# SavePreset will handle auto-increment if preset_name already exists
+		saved_name = self.SavePreset(preset_name)
+		if saved_name:
+			# Update current preset
+			self.SetActivePreset(saved_name)
+
+	def OnSaveas(self, par):
 		"""Callback for Saveas button - placeholder (functionality outside script)."""
 		# Placeholder - functionality handled outside script
 		pass
@@ -1075,7 +5210,7 @@ class presetterext:
 				lerp_enabled = self.ownerComp.par.Lerp.eval()
 				if lerp_enabled:
 					# Get lerp time and use lerp loading
-					lerptime = self.ownerComp.par.Lerptime
+					lerptime = self.ownerComp.par.Lerptime.eval()
 					self.LoadPresetWithLerp(preset_name, lerptime)
 				else:
 					# Load the preset values to target OP (instant)
@@ -1088,6 +5223,15 @@ class presetterext:
 
 	def OnRandomize(self, par):
 		"""Callback for Randomize button - randomizes parameters on targetOp based on par_table."""
+		self.RandomizePars()
+
+	def RandomizePars(self, mask=None):
+		"""
+		Randomize the par_table parameters on targetOp within their normMin/normMax.
+		mask: optional parameter subset to randomize (see DefineMask)
+		"""
+		import random
+
 		# Get target OP
 		try:
 			target_op = self.ownerComp.par.Targetop.eval()
@@ -1099,6 +5243,8 @@ class presetterext:
 			print("Warning: Target OP is None")
 			return
 
+		allowed = self._mask_target_names(mask, target_op) if mask is not None else None
+
 		# Read parameter names from par_table
 		if self.par_table is None:
 			print("Warning: par_table DAT not found")
@@ -1118,7 +5264,7 @@ class presetterext:
 			
 			par_name = str(self.par_table[r, 0].val).strip()
 			
-			if not par_name:
+			if not par_name or (allowed is not None and par_name not in allowed):
 				continue
 
 			try:
@@ -1232,11 +5378,16 @@ class presetterext:
 				
 				# Store preset (need to copy dict for property accessor)
 				presets = dict(self.Presets)
-				presets[preset_name] = pars_dict
+				presets[preset_name] = self._encode_preset(preset_name, pars_dict)
 				self.Presets = presets
+				self._invalidate_preset_caches(preset_name)
+				self._cache_decoded_preset(preset_name, presets[preset_name], pars_dict)
 				
 				# Update preset names list
-				self.UpdatePresetNames()
+				self._add_preset_name(preset_name)
+				self._touch_preset(preset_name)
+				self._record_change(('save', preset_name, pars_dict))
+				self._enforce_memory_budget()
 				
 				# Always set current preset to the newly imported one
 				self.CurrentPresetName = preset_name
@@ -1,23 +1,149 @@
 # par - the Par object that has changed
 # prev - the previous value
 
+PAGE_NAME = 'Presetter'
+MODULE_NAME = 'Presetter_Module'
+# Parameter Execute DAT in Presetter_Module that implements copy_and_bind
+BIND_DAT_NAME = 'parexec_copy_and_bind'
+
+# Give up on copies that are still not bound after this many frames
+MAX_BIND_FRAMES = 20
+
+# Copies waiting for their bind: [(copy, frames_waited), ...]
+_pending_binds = []
+_bind_scheduled = False
+
+
 def onValueChange(par, prev):
 	if not parent().panel.select :
 		parent().panel.state = par.eval()
-	
+
 	if int(par.eval()) == 1:
-		current_child = ui.panes.current.owner.currentChild
-		print(current_child.type)
-		if current_child is not None:
-			if current_child.isCOMP:
-				page_exists = False
-				for page in current_child.pages:
-					if page.name == 'Presetter':
-						page_exists = True
-						break
-				if not page_exists:
-					source_op = op.PRESETTER_TOOL.op('Presetter_Module')
-					if source_op is not None:
-						copy = current_child.copy(source_op)
-						run(lambda: copy.par.Copybindparstotarget.pulse(), delayFrames=20)
-	return
\ No newline at end of file
+		owner = ui.panes.current.owner
+		# Install onto the whole selection, or the current child if nothing is selected
+		targets = list(owner.selectedChildren) or [owner.currentChild]
+		InstallPresetter(targets)
+	return
+
+
+def HasPresetterPage(comp):
+	"""Return True if comp already carries a Presetter page."""
+	return any(page.name == PAGE_NAME for page in comp.customPages)
+
+
+def IsEligible(comp):
+	"""Return True if the Presetter module can be installed onto comp."""
+	if comp is None or not comp.isCOMP:
+		return False
+	if comp.name.startswith(MODULE_NAME) or HasPresetterPage(comp):
+		return False
+	tool = op.PRESETTER_TOOL
+	# Never install into the tool itself or into existing Presetter modules
+	if tool is not None and (comp == tool or comp.path.startswith(tool.path + '/')):
+		return False
+	return not any(p.name.startswith(MODULE_NAME) for p in _ancestors(comp))
+
+
+def CollectSubtree(root, maxDepth=None):
+	"""Return root and every COMP below it that is eligible for install."""
+	comps = [root] if root is not None and root.isCOMP else []
+	if root is not None and root.isCOMP:
+		kwargs = {'type': COMP}
+		if maxDepth is not None:
+			kwargs['maxDepth'] = maxDepth
+		comps.extend(root.findChildren(**kwargs))
+	return [c for c in comps if IsEligible(c)]
+
+
+def InstallPresetter(comps):
+	"""
+	Copy Presetter_Module onto every eligible COMP in comps and bind its
+	parameters onto the COMP as soon as the copy is ready.
+	Returns the list of created module copies.
+	"""
+	source_op = op.PRESETTER_TOOL.op(MODULE_NAME)
+	if source_op is None:
+		print("Warning: Presetter_Module not found")
+		return []
+
+	copies = []
+	for comp in comps:
+		if not IsEligible(comp):
+			continue
+		copy = comp.copy(source_op)
+		copies.append(copy)
+		if not _try_bind(copy):
+			_pending_binds.append((copy, 0))
+
+	_schedule_pending_binds()
+	print(f"Presetter installed on {len(copies)} COMPs")
+	return copies
+
+
+def InstallPresetterSubtree(root, maxDepth=None):
+	"""Install Presetter onto root and every eligible COMP below it."""
+	return InstallPresetter(CollectSubtree(root, maxDepth))
+
+
+def _ancestors(comp):
+	p = comp.parent()
+	while p is not None:
+		yield p
+		p = p.parent()
+
+
+def _bind_module(copy):
+	"""Return the module of copy's bind DAT if it implements copy_and_bind, or None."""
+	dat = copy.op(BIND_DAT_NAME)
+	if dat is None:
+		return None
+	try:
+		module = dat.module
+	except Exception:
+		return None
+	return module if hasattr(module, 'copy_and_bind') else None
+
+
+def _try_bind(copy):
+	"""Bind copy onto its target if it is ready. Returns True when bound."""
+	try:
+		if not copy.valid:
+			return True  # deleted in the meantime, nothing left to do
+		target = copy.par.Targetop.eval()
+	except Exception:
+		return False
+	if target is None:
+		return False
+
+	module = _bind_module(copy)
+	try:
+		if module is not None:
+			module.copy_and_bind(copy, target)
+		else:
+			copy.par.Copybindparstotarget.pulse()
+	except Exception:
+		return False
+	return HasPresetterPage(target)
+
+
+def _schedule_pending_binds():
+	global _bind_scheduled
+	if _pending_binds and not _bind_scheduled:
+		_bind_scheduled = True
+		# One callback per frame for the whole batch, not one per copy
+		run(_drain_pending_binds, delayFrames=1)
+
+
+def _drain_pending_binds():
+	global _bind_scheduled
+	_bind_scheduled = False
+	still_pending = []
+	for copy, frames in _pending_binds:
+		if _try_bind(copy):
+			continue
+		if frames + 1 >= MAX_BIND_FRAMES:
+			print(f"Warning: Could not bind Presetter in '{copy.path}'")
+			continue
+		still_pending.append((copy, frames + 1))
+	_pending_binds[:] = still_pending
+	_schedule_pending_binds()